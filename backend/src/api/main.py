@@ -3,7 +3,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.db.sqlite_db import init_db
+from src.db.sqlite_db import close_pool, init_db, open_pool
 from src.db.analysis_task_store import recover_stale_tasks
 from src.services.sample_data_service import auto_import_samples
 from src.api.routes import (
@@ -93,7 +93,11 @@ async def lifespan(app: FastAPI):
     await auto_import_samples()
     # Recover tasks left in 'running' state from a previous server session
     await recover_stale_tasks()
-    yield
+    open_pool()
+    try:
+        yield
+    finally:
+        await close_pool()
 
 
 app = FastAPI(title="AI Reader V2", version="0.1.0", lifespan=lifespan)
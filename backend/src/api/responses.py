@@ -0,0 +1,19 @@
+"""Shared response classes for API routes."""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from src.utils import fast_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered through fast_json (orjson when installed).
+
+    Used as the default response class of the visualization routers, whose
+    payloads (graph edges, map layouts, timeline events) are the largest the
+    API returns. Output is compact UTF-8 either way, as with JSONResponse.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return fast_json.dumps_bytes(content)
@@ -6,14 +6,19 @@ from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
+from src.api.responses import FastJSONResponse
 from src.db import novel_store
 from src.services.visualization_service import (
     get_map_data,
     get_analyzed_range,
     save_user_override,
+    save_user_overrides_bulk,
 )
 
-router = APIRouter(prefix="/api/novels/{novel_id}/map", tags=["map"])
+router = APIRouter(
+    prefix="/api/novels/{novel_id}/map", tags=["map"],
+    default_response_class=FastJSONResponse,
+)
 
 
 @router.get("")
@@ -86,6 +91,24 @@ async def update_location_override(
     return {"status": "ok", "message": "位置已保存"}
 
 
+class BulkOverrideItem(OverrideRequest):
+    location_name: str
+
+
+@router.put("/layout")
+async def update_location_overrides_bulk(
+    novel_id: str,
+    body: list[BulkOverrideItem],
+):
+    """Save several location overrides (e.g. multi-pin drag) in one transaction."""
+    novel = await novel_store.get_novel(novel_id)
+    if not novel:
+        raise HTTPException(status_code=404, detail="小说不存在")
+
+    await save_user_overrides_bulk(novel_id, [item.model_dump() for item in body])
+    return {"status": "ok", "message": f"已保存 {len(body)} 个位置"}
+
+
 @router.get("/terrain")
 async def get_terrain(novel_id: str):
     """Serve the generated terrain PNG image."""
@@ -2,10 +2,14 @@
 
 from fastapi import APIRouter, HTTPException, Query
 
+from src.api.responses import FastJSONResponse
 from src.db import novel_store
 from src.services.visualization_service import get_timeline_data, get_analyzed_range
 
-router = APIRouter(prefix="/api/novels/{novel_id}/timeline", tags=["timeline"])
+router = APIRouter(
+    prefix="/api/novels/{novel_id}/timeline", tags=["timeline"],
+    default_response_class=FastJSONResponse,
+)
 
 
 @router.get("")
@@ -9,6 +9,7 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from src.db import novel_store, world_structure_store, world_structure_override_store
+from src.services.visualization_service import invalidate_map_cache
 
 logger = logging.getLogger(__name__)
 
@@ -117,6 +118,7 @@ async def save_overrides(novel_id: str, body: OverridesBatch):
 
     # Invalidate layout cache since structure changed
     await world_structure_store.delete_layer_layouts(novel_id)
+    invalidate_map_cache(novel_id)
 
     ws = await world_structure_store.load_with_overrides(novel_id)
     return ws.model_dump()
@@ -903,6 +905,7 @@ async def apply_hierarchy_changes(novel_id: str, body: HierarchyChangesRequest):
 
     # Invalidate layout cache since hierarchy changed
     await world_structure_store.delete_layer_layouts(novel_id)
+    invalidate_map_cache(novel_id)
 
     # Clear map coordinate overrides for affected locations so they get
     # repositioned by the constraint solver based on the new hierarchy.
@@ -950,6 +953,7 @@ async def delete_override(novel_id: str, override_id: int):
 
     # Invalidate layout cache
     await world_structure_store.delete_layer_layouts(novel_id)
+    invalidate_map_cache(novel_id)
 
     ws = await world_structure_store.load_with_overrides(novel_id)
     return ws.model_dump()
@@ -987,6 +991,7 @@ async def spatial_completion(novel_id: str):
 
             # Invalidate layout cache so next map load uses new spatial data
             await world_structure_store.delete_layer_layouts(novel_id)
+            invalidate_map_cache(novel_id)
 
         except Exception as e:
             logger.error("Spatial completion failed for %s", novel_id, exc_info=True)
@@ -1,9 +1,123 @@
 """CRUD operations for chapter_facts table."""
 
+import asyncio
+import hashlib
 import json
+from collections import OrderedDict
+
+from pydantic import TypeAdapter
 
 from src.db.sqlite_db import get_connection
 from src.models.chapter_fact import ChapterFact
+from src.utils import fast_json
+
+_FACT_LIST_ADAPTER = TypeAdapter(list[ChapterFact])
+
+FACT_FETCH_CHUNK = 256
+
+# (novel_id, chapter_num, digest of fact_json) -> parsed fact, LRU order.
+# Keyed by a digest of the stored text, so a re-extracted or re-imported
+# fact never hits a stale entry and no invalidation is needed, without
+# keeping every fact's JSON text alive next to the parsed object.
+_parsed_fact_cache: OrderedDict[tuple[str, int, bytes], ChapterFact] = OrderedDict()
+_PARSED_FACT_CACHE_MAX = 4096
+
+
+def _fact_cache_key(novel_id: str, chapter_num: int, fact_json: str) -> tuple[str, int, bytes]:
+    digest = hashlib.blake2b(fact_json.encode(), digest_size=16).digest()
+    return novel_id, chapter_num, digest
+
+
+def parse_fact_rows(
+    rows: list[tuple[str, int]], novel_id: str,
+) -> list[ChapterFact]:
+    """Parse (fact_json, chapter_num) rows into ChapterFacts.
+
+    The stored chapter_id is replaced by the chapter number, and the whole
+    batch is validated in one TypeAdapter call. CPU-bound on long novels;
+    async callers should run it via asyncio.to_thread.
+    """
+    payload = []
+    for fact_json, chapter_num in rows:
+        data = fast_json.loads(fact_json)
+        data["chapter_id"] = chapter_num
+        data["novel_id"] = novel_id
+        payload.append(data)
+    return validate_fact_dicts(payload)
+
+
+def validate_fact_dicts(payload: list[dict]) -> list[ChapterFact]:
+    """Validate decoded fact dicts in one TypeAdapter call.
+
+    Raises ValidationError if any entry is invalid; callers that must skip
+    bad rows individually can fall back to per-row validation then.
+    """
+    return _FACT_LIST_ADAPTER.validate_python(payload)
+
+
+async def _parse_rows_cached(
+    rows: list[tuple[str, int]], novel_id: str,
+) -> list[ChapterFact]:
+    """parse_fact_rows through the parsed-fact cache; only misses are parsed.
+
+    Cache reads and writes stay on the event loop; the worker thread only
+    sees the missed rows.
+    """
+    facts: list[ChapterFact | None] = []
+    missed: list[tuple[str, int]] = []
+    keys = [_fact_cache_key(novel_id, chapter_num, fact_json) for fact_json, chapter_num in rows]
+    for key, (fact_json, chapter_num) in zip(keys, rows):
+        fact = _parsed_fact_cache.get(key)
+        if fact is None:
+            missed.append((fact_json, chapter_num))
+        else:
+            _parsed_fact_cache.move_to_end(key)
+        facts.append(fact)
+    if not missed:
+        return facts
+    parsed = iter(await asyncio.to_thread(parse_fact_rows, missed, novel_id))
+    for i, key in enumerate(keys):
+        if facts[i] is None:
+            facts[i] = fact = next(parsed)
+            _parsed_fact_cache[key] = fact
+    while len(_parsed_fact_cache) > _PARSED_FACT_CACHE_MAX:
+        _parsed_fact_cache.popitem(last=False)
+    return facts
+
+
+async def read_fact_rows(
+    cursor, novel_id: str, chunk_size: int = FACT_FETCH_CHUNK,
+    shared: bool = False,
+) -> list[ChapterFact]:
+    """Stream (fact_json, chapter_num) rows from ``cursor`` into ChapterFacts.
+
+    Each chunk is decoded + validated in a worker thread while the next one
+    is fetched, so only ~two chunks of raw fact_json are alive at once and
+    the event loop never parses.
+
+    With ``shared=True`` unchanged rows are served from a process-wide cache
+    of parsed facts instead of being re-validated. The returned objects are
+    then shared between callers and must be treated as read-only.
+    """
+    parse = (
+        _parse_rows_cached if shared
+        else lambda rows, nid: asyncio.to_thread(parse_fact_rows, rows, nid)
+    )
+    facts: list[ChapterFact] = []
+    pending: asyncio.Future | None = None
+    try:
+        while chunk := await cursor.fetchmany(chunk_size):
+            rows = [(r["fact_json"], r["chapter_num"]) for r in chunk]
+            if pending is not None:
+                facts.extend(await pending)
+            pending = asyncio.ensure_future(parse(rows, novel_id))
+        if pending is not None:
+            facts.extend(await pending)
+            pending = None
+    finally:
+        if pending is not None:
+            pending.cancel()
+    return facts
 
 
 async def insert_chapter_fact(
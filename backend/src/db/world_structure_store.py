@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import json
 import logging
 
-from src.db.sqlite_db import get_connection
+from src.db.sqlite_db import acquire_connection, get_connection, release_connection
 from src.models.world_structure import Portal, WorldStructure
+from src.utils import fast_json
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +60,8 @@ async def save(novel_id: str, structure: WorldStructure) -> None:
 
 async def load(novel_id: str) -> WorldStructure | None:
     """Load the world structure for a novel. Returns Pydantic model or None."""
-    conn = await get_connection()
+    # Read on every map request: use a pooled connection
+    conn = await acquire_connection()
     try:
         cursor = await conn.execute(
             "SELECT structure_json FROM world_structures WHERE novel_id = ?",
@@ -69,10 +70,11 @@ async def load(novel_id: str) -> WorldStructure | None:
         row = await cursor.fetchone()
         if row is None:
             return None
-        data = json.loads(row["structure_json"])
-        return WorldStructure.model_validate(data)
+        # Validate straight from the JSON text: pydantic-core parses it
+        # without building an intermediate dict first
+        return WorldStructure.model_validate_json(row["structure_json"])
     finally:
-        await conn.close()
+        await release_connection(conn)
 
 
 async def delete(novel_id: str) -> None:
@@ -117,11 +119,46 @@ async def save_layer_layout(
         await conn.close()
 
 
+async def save_layer_layouts(
+    novel_id: str,
+    chapter_hash: str,
+    layouts: list[tuple[str, str]],
+    layout_mode: str = "hierarchy",
+) -> None:
+    """Insert or update several layers' cached layouts in one transaction.
+
+    ``layouts`` is a list of (layer_id, layout_json) pairs.
+    """
+    if not layouts:
+        return
+    conn = await get_connection()
+    try:
+        await conn.executemany(
+            """
+            INSERT INTO layer_layouts
+                (novel_id, layer_id, chapter_hash, layout_json, layout_mode, terrain_path)
+            VALUES (?, ?, ?, ?, ?, NULL)
+            ON CONFLICT(novel_id, layer_id, chapter_hash) DO UPDATE SET
+                layout_json = excluded.layout_json,
+                layout_mode = excluded.layout_mode,
+                terrain_path = excluded.terrain_path,
+                created_at = datetime('now')
+            """,
+            [
+                (novel_id, layer_id, chapter_hash, layout_json, layout_mode)
+                for layer_id, layout_json in layouts
+            ],
+        )
+        await conn.commit()
+    finally:
+        await conn.close()
+
+
 async def load_layer_layout(
     novel_id: str, layer_id: str, chapter_hash: str
 ) -> dict | None:
     """Load a cached layer layout. Returns parsed dict or None."""
-    conn = await get_connection()
+    conn = await acquire_connection()
     try:
         cursor = await conn.execute(
             """
@@ -135,13 +172,13 @@ async def load_layer_layout(
         if row is None:
             return None
         return {
-            "layout": json.loads(row["layout_json"]),
+            "layout": fast_json.loads(row["layout_json"]),
             "layout_mode": row["layout_mode"],
             "terrain_path": row["terrain_path"],
             "created_at": row["created_at"],
         }
     finally:
-        await conn.close()
+        await release_connection(conn)
 
 
 async def delete_layer_layouts(novel_id: str) -> None:
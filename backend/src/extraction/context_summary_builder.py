@@ -4,7 +4,9 @@ import json
 import logging
 from collections import Counter
 
-from src.db.chapter_fact_store import get_all_chapter_facts
+from pydantic import ValidationError
+
+from src.db.chapter_fact_store import get_all_chapter_facts, validate_fact_dicts
 from src.db import entity_dictionary_store, world_structure_store
 from src.infra.context_budget import get_budget
 from src.models.chapter_fact import ChapterFact
@@ -52,15 +54,21 @@ class ContextSummaryBuilder:
                     f for f in all_facts
                     if f["fact"]["chapter_id"] < chapter_num
                 ]
-                for row in preceding:
-                    try:
-                        chapter_facts.append(
-                            ChapterFact.model_validate(row["fact"])
-                        )
-                    except Exception as e:
-                        logger.warning("Skipping malformed ChapterFact for chapter %d: %s",
-                                       row.get("chapter_num", "?"), e)
-                        continue
+                # Every preceding chapter is re-read for each new chapter:
+                # validate them in one batch, and only go row by row (to
+                # skip the malformed ones) when the batch fails.
+                try:
+                    chapter_facts = validate_fact_dicts([row["fact"] for row in preceding])
+                except ValidationError:
+                    for row in preceding:
+                        try:
+                            chapter_facts.append(
+                                ChapterFact.model_validate(row["fact"])
+                            )
+                        except Exception as e:
+                            logger.warning("Skipping malformed ChapterFact for chapter %s: %s",
+                                           row.get("chapter_id", "?"), e)
+                            continue
 
         if chapter_facts:
             # Determine active window
@@ -231,7 +239,8 @@ class ContextSummaryBuilder:
         pair_map: dict[tuple[str, str], str] = {}
         for fact in all_facts:
             for rel in fact.relationships:
-                key = tuple(sorted([rel.person_a, rel.person_b]))
+                a, b = rel.person_a, rel.person_b
+                key = (a, b) if a <= b else (b, a)
                 pair_map[key] = rel.relation_type
 
         # Filter to pairs involving recently active characters
@@ -5,6 +5,7 @@ Location filtering uses a 3-layer approach based on Chinese place name morpholog
 """
 
 import logging
+from functools import lru_cache
 
 from src.utils.location_names import is_homonym_prone
 
@@ -742,11 +743,14 @@ _HISTORICAL_GENERIC_FACILITIES = frozenset({
 })
 
 
+@lru_cache(maxsize=8192)
 def _is_generic_location(name: str, genre: str | None = None) -> str | None:
     """Check if a location name is generic/invalid using morphological rules.
 
     Genre-aware: fantasy allows 仙界/魔界/洞府/秘境 etc.
     Returns a reason string if the name should be filtered, or None if it should be kept.
+    Pure over module constants, so results are memoised: the same names are
+    re-checked in every chapter and by the hierarchy passes.
     """
     n = len(name)
 
@@ -2,7 +2,15 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel, field_validator
+import sys
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, field_validator
+
+# Entity names recur across every chapter and end up as dict keys in the
+# visualization aggregations; interning makes equal names share one object
+# so those lookups hit the identity fast path and parsed facts stay smaller.
+Name = Annotated[str, AfterValidator(sys.intern)]
 
 
 class AbilityGained(BaseModel):
@@ -12,11 +20,11 @@ class AbilityGained(BaseModel):
 
 
 class CharacterFact(BaseModel):
-    name: str
-    new_aliases: list[str] = []
+    name: Name
+    new_aliases: list[Name] = []
     appearance: str | None = None
     abilities_gained: list[AbilityGained] = []
-    locations_in_chapter: list[str] = []
+    locations_in_chapter: list[Name] = []
 
     @field_validator("abilities_gained", mode="before")
     @classmethod
@@ -34,8 +42,8 @@ class CharacterFact(BaseModel):
 
 
 class RelationshipFact(BaseModel):
-    person_a: str
-    person_b: str
+    person_a: Name
+    person_b: Name
     relation_type: str
     is_new: bool = True
     previous_type: str | None = None
@@ -43,9 +51,9 @@ class RelationshipFact(BaseModel):
 
 
 class LocationFact(BaseModel):
-    name: str
+    name: Name
     type: str
-    parent: str | None = None
+    parent: Name | None = None
     parent_evidence: str | None = None  # v0.63.0: evidence for parent assignment (≤30 chars)
     peers: list[str] | None = None  # same-level spatially adjacent/parallel entities
     description: str | None = None
@@ -67,9 +75,9 @@ class OrgRelation(BaseModel):
 
 
 class OrgEventFact(BaseModel):
-    org_name: str = ""
+    org_name: Name = ""
     org_type: str = ""
-    member: str | None = None
+    member: Name | None = None
     role: str | None = None
     action: str = "其他"  # 加入/离开/晋升/阵亡/叛出/逐出 (default for LLM omission tolerance)
     description: str | None = None
@@ -80,12 +88,12 @@ class EventFact(BaseModel):
     summary: str
     type: str  # 战斗/成长/社交/旅行/其他
     importance: str = "medium"  # high/medium/low
-    participants: list[str] = []
-    location: str | None = None
+    participants: list[Name] = []
+    location: Name | None = None
 
 
 class ConceptFact(BaseModel):
-    name: str
+    name: Name
     category: str  # 修炼体系/种族/货币/功法/...
     definition: str | None = ""
     related: list[str] = []
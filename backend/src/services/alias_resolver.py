@@ -11,8 +11,10 @@ See _is_unsafe_alias() for the filtering logic.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import sys
 from collections import defaultdict
 
 from src.db.sqlite_db import get_connection
@@ -34,10 +36,22 @@ _alias_override_targets: dict[str, dict[str, set[str]]] = {}
 # stops listing them under the source even when they detached to a new entity
 # (alias_map alone can't express "removed from X" for to=None splits).
 _alias_detached: dict[str, dict[str, set[str]]] = {}
+# novel_id -> in-flight build, so concurrent first callers share one build.
+_alias_inflight: dict[str, asyncio.Future] = {}
+# novel_id -> invalidation counter; a build started under an older generation
+# returns its result but does not cache it.
+_alias_generation: dict[str, int] = {}
+
+
+def alias_generation(novel_id: str) -> int:
+    """Counter bumped by every invalidate_alias_cache call for the novel."""
+    return _alias_generation.get(novel_id, 0)
 
 
 def invalidate_alias_cache(novel_id: str) -> None:
     """Clear cached alias map for a novel (call after prescan or analysis completes)."""
+    _alias_generation[novel_id] = _alias_generation.get(novel_id, 0) + 1
+    _alias_inflight.pop(novel_id, None)
     _alias_cache.pop(novel_id, None)
     _alias_conflicts.pop(novel_id, None)
     _alias_override_targets.pop(novel_id, None)
@@ -307,11 +321,33 @@ async def build_alias_map(novel_id: str) -> dict[str, str]:
     if novel_id in _alias_cache:
         return _alias_cache[novel_id]
 
+    fut = _alias_inflight.get(novel_id)
+    if fut is None:
+        fut = asyncio.ensure_future(
+            _build_and_cache(novel_id, _alias_generation.get(novel_id, 0))
+        )
+        _alias_inflight[novel_id] = fut
+        fut.add_done_callback(lambda f: _forget_inflight(novel_id, f))
+    # Shield the shared build: a cancelled caller must not cancel it for
+    # the other callers awaiting the same future.
+    return await asyncio.shield(fut)
+
+
+def _forget_inflight(novel_id: str, fut: asyncio.Future) -> None:
+    if _alias_inflight.get(novel_id) is fut:
+        del _alias_inflight[novel_id]
+
+
+async def _build_and_cache(novel_id: str, generation: int) -> dict[str, str]:
     alias_map = await _build_merged(novel_id)
     alias_map = _apply_known_hotfix_patches(alias_map)
     alias_map = await _apply_user_overrides(novel_id, alias_map)
+    # Intern once here so every consumer (graph, factions, aggregator) keys its
+    # dicts on the same canonical string objects instead of per-fact copies.
+    alias_map = {sys.intern(a): sys.intern(c) for a, c in alias_map.items()}
 
-    _alias_cache[novel_id] = alias_map
+    if _alias_generation.get(novel_id, 0) == generation:
+        _alias_cache[novel_id] = alias_map
     if alias_map:
         logger.info("Built alias map for novel %s: %d aliases", novel_id, len(alias_map))
     return alias_map
@@ -20,12 +20,17 @@ from src.infra.llm_client import LLMError, LLMParseError, LLMTimeoutError, LlmUs
 from src.models.world_structure import WorldStructure
 from src.services.cost_service import add_monthly_usage, get_monthly_budget, get_monthly_usage, get_pricing
 from src.services import embedding_service
+from src.services.alias_resolver import invalidate_alias_cache
 from src.services.hierarchy_consolidator import consolidate_hierarchy
 from src.services.visualization_service import invalidate_layout_cache
 from src.services.world_structure_agent import WorldStructureAgent
 
 logger = logging.getLogger(__name__)
 
+# Cloud models take one world-structure update for several triggering
+# chapters; local models keep per-chapter updates within their context.
+_WS_LLM_BATCH_CLOUD = 4
+
 # Keywords that indicate a content-policy rejection from cloud APIs
 _CONTENT_POLICY_SIGNALS = [
     "content_filter", "content_policy", "sensitive_words", "sensitive",
@@ -95,6 +100,12 @@ class AnalysisService:
         # Track running tasks for pause/cancel
         self._task_signals: dict[str, str] = {}  # task_id -> desired status
         self._active_loops: set[str] = set()  # task_ids with currently-running loops
+        # World-structure agent of each running loop, persisted by _run_loop
+        # on every exit path
+        self._world_agents: dict[str, WorldStructureAgent] = {}
+        # World-structure agents of paused tasks; the resumed loop takes over
+        # their queued and in-flight LLM updates
+        self._paused_world_agents: dict[str, WorldStructureAgent] = {}
         # Live timing stats per novel (survives page navigation)
         self._live_timing: dict[str, dict] = {}
         # Retry progress per novel (survives page navigation)
@@ -124,6 +135,40 @@ class AnalysisService:
             "llm_provider": LLM_PROVIDER,
         })
 
+    @staticmethod
+    async def _flush_world_agent(world_agent: WorldStructureAgent) -> None:
+        """Send queued world-structure updates and write the unsaved structure."""
+        try:
+            await world_agent.flush_llm_updates()
+        except Exception as e:
+            logger.warning(
+                "World structure flush failed for %s: %s", world_agent.novel_id, e,
+            )
+
+    @staticmethod
+    async def _suspend_world_agent(world_agent: WorldStructureAgent) -> None:
+        """Write the structure on pause, keeping its pending LLM updates."""
+        try:
+            await world_agent.suspend_llm_updates()
+        except Exception as e:
+            logger.warning(
+                "World structure save failed for %s: %s", world_agent.novel_id, e,
+            )
+
+    @staticmethod
+    async def _discard_world_agent(world_agent: WorldStructureAgent) -> None:
+        """Drop queued/in-flight world-structure updates and write the structure.
+
+        Used on cancel, where waiting on the LLM would leave the loop alive
+        after the signal check.
+        """
+        try:
+            await world_agent.discard_llm_updates()
+        except Exception as e:
+            logger.warning(
+                "World structure save failed for %s: %s", world_agent.novel_id, e,
+            )
+
     async def start(
         self,
         novel_id: str,
@@ -202,6 +247,9 @@ class AnalysisService:
         self._task_signals[task_id] = "cancelled"
         # Immediate DB + broadcast so frontend updates without waiting for the loop
         await analysis_task_store.update_task_status(task_id, "cancelled")
+        paused_agent = self._paused_world_agents.pop(task_id, None)
+        if paused_agent is not None:
+            await self._discard_world_agent(paused_agent)
         await manager.broadcast(task["novel_id"], {"type": "task_status", "status": "cancelled"})
 
     async def _ensure_prescan(self, novel_id: str) -> None:
@@ -253,7 +301,19 @@ class AnalysisService:
         try:
             await self._run_loop_inner(task_id, novel_id, chapter_start, chapter_end, force)
         finally:
+            # The agent saves only every few chapters: write what is left and
+            # cancel stray LLM requests on cancel or error. A normal end has
+            # already flushed, and a paused agent is kept for resume.
+            world_agent = self._world_agents.pop(task_id, None)
+            if (
+                world_agent is not None
+                and self._paused_world_agents.get(task_id) is not world_agent
+            ):
+                await self._discard_world_agent(world_agent)
             self._active_loops.discard(task_id)
+            # New chapter facts can carry new aliases; drop the alias map once
+            # the run stops (end, pause, cancel) rather than after every chapter
+            invalidate_alias_cache(novel_id)
 
     async def _run_loop_inner(
         self,
@@ -313,11 +373,18 @@ class AnalysisService:
                     stats["events"] += len(fact_data.get("events", []))
 
         # Initialize WorldStructureAgent (loads existing or creates default)
-        world_agent = WorldStructureAgent(novel_id)
+        world_agent = WorldStructureAgent(
+            novel_id, llm_batch_size=_WS_LLM_BATCH_CLOUD if is_cloud else 1,
+        )
+        self._world_agents[task_id] = world_agent
         try:
             await world_agent.load_or_init()
         except Exception as e:
             logger.warning("WorldStructureAgent init failed for %s: %s", novel_id, e)
+        # Resumed after pause: re-queue the updates the paused run left behind
+        paused_agent = self._paused_world_agents.pop(task_id, None)
+        if paused_agent is not None:
+            world_agent.adopt_llm_updates(paused_agent)
 
         # Create a per-analysis validator to avoid shared state between concurrent novels
         validator = FactValidator(
@@ -375,9 +442,16 @@ class AnalysisService:
         for chapter_num in range(chapter_start, chapter_end + 1):
             # Check for pause/cancel signal
             signal = self._task_signals.get(task_id, "running")
+            if signal == "paused":
+                # Save without waiting on the LLM, then re-check: a resume
+                # during the save finds this loop still active and relies on
+                # it to continue
+                await self._suspend_world_agent(world_agent)
+                signal = self._task_signals.get(task_id, "running")
             if signal == "paused":
                 # DB status and broadcast already handled by pause()
                 logger.info("Task %s loop stopping (paused) at chapter %d", task_id, chapter_num)
+                self._paused_world_agents[task_id] = world_agent
                 return
             if signal == "cancelled":
                 # DB status and broadcast already handled by cancel()
@@ -746,6 +820,8 @@ class AnalysisService:
                         error_msg=err_msg, error_type=err_type,
                     )
 
+        await self._flush_world_agent(world_agent)
+
         # ── Persist timing summary ──
         if _chapter_times:
             timing_summary = {
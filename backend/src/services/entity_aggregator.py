@@ -6,12 +6,12 @@ Uses LRU caching keyed by (novel_id, entity_name) with per-novel invalidation.
 
 from __future__ import annotations
 
-import json
 import logging
 from collections import defaultdict
 from functools import lru_cache
 from typing import Any
 
+from src.db.chapter_fact_store import read_fact_rows
 from src.db.sqlite_db import get_connection
 from src.models.chapter_fact import ChapterFact
 from src.services.alias_resolver import build_alias_map
@@ -117,14 +117,7 @@ async def _load_chapter_facts(novel_id: str) -> list[ChapterFact]:
             """,
             (novel_id,),
         )
-        rows = await cursor.fetchall()
-        facts: list[ChapterFact] = []
-        for row in rows:
-            data = json.loads(row["fact_json"])
-            data["chapter_id"] = row["chapter_num"]
-            data["novel_id"] = novel_id
-            facts.append(ChapterFact.model_validate(data))
-        return facts
+        return await read_fact_rows(cursor, novel_id)
     finally:
         await conn.close()
 
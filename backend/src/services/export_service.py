@@ -21,11 +21,8 @@ async def _build_precomputed(novel_id: str) -> dict | None:
     """
     try:
         from src.services.visualization_service import (
+            get_all_visualizations,
             get_analyzed_range,
-            get_graph_data,
-            get_map_data,
-            get_timeline_data,
-            get_factions_data,
         )
         from src.services.encyclopedia_service import (
             get_category_stats,
@@ -38,10 +35,7 @@ async def _build_precomputed(novel_id: str) -> dict | None:
             logger.warning("Novel %s has no analyzed chapters, skipping precomputed", novel_id)
             return None
 
-        graph = await get_graph_data(novel_id, ch_start, ch_end)
-        map_data = await get_map_data(novel_id, ch_start, ch_end)
-        timeline = await get_timeline_data(novel_id, ch_start, ch_end)
-        factions = await get_factions_data(novel_id, ch_start, ch_end)
+        views = await get_all_visualizations(novel_id, ch_start, ch_end)
 
         encyclopedia = await get_encyclopedia_entries(novel_id)
         encyclopedia_stats = await get_category_stats(novel_id)
@@ -50,12 +44,12 @@ async def _build_precomputed(novel_id: str) -> dict | None:
         world_structure = ws.model_dump() if ws else None
 
         return {
-            "graph": graph,
-            "map": map_data,
-            "timeline": timeline,
+            "graph": views["graph"],
+            "map": views["map"],
+            "timeline": views["timeline"],
             "encyclopedia": encyclopedia,
             "encyclopedia_stats": encyclopedia_stats,
-            "factions": factions,
+            "factions": views["factions"],
             "world_structure": world_structure,
         }
     except Exception as e:
@@ -17,6 +17,8 @@ import time
 from collections import Counter
 from dataclasses import dataclass, field
 
+from src.utils.topology_metrics import parent_chain_depths
+
 
 @dataclass(frozen=True)
 class HierarchySnapshot:
@@ -135,19 +137,9 @@ class HierarchyMetrics:
         tiers = snapshot.location_tiers
         freq = snapshot.location_frequencies
 
-        # Depth computation
-        def _depth(loc: str, visited: set | None = None) -> int:
-            if visited is None:
-                visited = set()
-            if loc in visited:
-                return 0
-            visited.add(loc)
-            p = parents.get(loc)
-            if not p:
-                return 0
-            return 1 + _depth(p, visited)
-
-        depths = {loc: _depth(loc) for loc in tiers}
+        # Depth computation: every chain is walked once, not once per member
+        chain_depths = parent_chain_depths(parents)
+        depths = {loc: chain_depths.get(loc, 0) for loc in tiers}
         avg_d = sum(depths.values()) / len(depths) if depths else 0.0
         max_d = max(depths.values()) if depths else 0
 
@@ -17,8 +17,8 @@ from src.services.geo_skills.base import GeoSkill
 from src.services.geo_skills.snapshot import HierarchySnapshot, SkillResult
 from src.services.world_structure_agent import (
     TIER_ORDER,
-    _NAME_SUFFIX_TIER,
     _get_suffix_rank,
+    _match_name_suffix,
 )
 
 logger = logging.getLogger(__name__)
@@ -191,11 +191,8 @@ class VoteResolver(GeoSkill):
 
             is_sibling = False
             if c_suf is not None and p_suf is not None and c_suf == p_suf:
-                suffix_char = None
-                for suf, _ in _NAME_SUFFIX_TIER:
-                    if child.endswith(suf):
-                        suffix_char = suf
-                        break
+                suffix_hit = _match_name_suffix(child)
+                suffix_char = suffix_hit[0] if suffix_hit else None
                 if suffix_char in _SIBLING_SUFFIXES:
                     is_sibling = True
             elif c_suf is None and p_suf is None:
@@ -397,8 +397,6 @@ def _tiered_catchall(
     # 2. Build candidate lookup: all nodes that already have a place in the hierarchy
     existing_nodes = set(location_parents.keys()) | set(location_parents.values())
     existing_nodes.discard(uber_root)
-    # Sort by name length descending for longest-prefix-first matching
-    sorted_candidates = sorted(existing_nodes, key=len, reverse=True)
 
     # 3. Sort orphans: most specific (building/room) first, so they can find
     #    intermediate parents before less specific orphans are processed
@@ -417,12 +415,12 @@ def _tiered_catchall(
         matched = False
 
         # Try name prefix matching: orphan starts with a known node's name
-        # e.g., "七玄门百药园" starts with "七玄门"
+        # e.g., "七玄门百药园" starts with "七玄门". Walk the orphan's own
+        # proper prefixes (≥2 chars) longest-first and probe the set.
         if orphan_rank >= 4:  # city or more specific
-            for candidate in sorted_candidates:
-                if candidate == orphan:
-                    continue
-                if not orphan.startswith(candidate) or len(candidate) < 2:
+            for end in range(len(orphan) - 1, 1, -1):
+                candidate = orphan[:end]
+                if candidate not in existing_nodes:
                     continue
                 cand_tier = location_tiers.get(candidate, "city")
                 cand_rank = TIER_ORDER.get(cand_tier, 4)
@@ -98,6 +98,12 @@ _CELESTIAL_KEYWORDS = ("天宫", "天庭", "天门", "天界", "三十三天", "
                        "九天应元府")
 _UNDERWORLD_KEYWORDS = ("地府", "冥界", "幽冥", "阴司", "阴曹", "黄泉",
                         "奈何桥", "阎罗殿", "森罗殿", "枉死城")
+# One C-level scan per name instead of a Python loop over every keyword
+_CELESTIAL_RE = re.compile("|".join(map(re.escape, _CELESTIAL_KEYWORDS)))
+_UNDERWORLD_RE = re.compile("|".join(map(re.escape, _UNDERWORLD_KEYWORDS)))
+_NON_GEOGRAPHIC_RE = re.compile(
+    "|".join(map(re.escape, _CELESTIAL_KEYWORDS + _UNDERWORLD_KEYWORDS))
+)
 
 # Celestial locations placed in top zone (small Y in SVG), underworld in bottom
 _CELESTIAL_Y_RANGE = (CANVAS_MIN_Y, CANVAS_MIN_Y + 30)
@@ -1296,7 +1302,8 @@ def _detect_and_remove_conflicts(
 
     for c in constraints:
         if c["relation_type"] == "direction":
-            key = tuple(sorted([c["source"], c["target"]]))
+            src, tgt = c["source"], c["target"]
+            key = (src, tgt) if src <= tgt else (tgt, src)
             direction_map.setdefault(key, []).append(c)
         else:
             non_direction.append(c)
@@ -1364,17 +1371,22 @@ _DEFAULT_MAX_SOLVER_LOCATIONS = 80
 
 def _is_celestial(name: str) -> bool:
     """Check if a location name indicates a celestial/heavenly place."""
-    return any(kw in name for kw in _CELESTIAL_KEYWORDS)
+    return _CELESTIAL_RE.search(name) is not None
 
 
 def _is_underworld(name: str) -> bool:
     """Check if a location name indicates an underworld place."""
-    return any(kw in name for kw in _UNDERWORLD_KEYWORDS)
+    return _UNDERWORLD_RE.search(name) is not None
 
 
 def _is_non_geographic(name: str) -> bool:
     """Check if a location is not a physical geographic place."""
-    return _is_celestial(name) or _is_underworld(name)
+    return _NON_GEOGRAPHIC_RE.search(name) is not None
+
+
+# Macro-scale geographic keywords used by narrative-axis detection
+_MACRO_TYPE_KW = ("洲", "国", "域", "界", "大陆", "大海", "海", "部洲")
+_MACRO_TYPE_RE = re.compile("|".join(map(re.escape, _MACRO_TYPE_KW)))
 
 
 def _detect_narrative_axis(
@@ -1398,8 +1410,6 @@ def _detect_narrative_axis(
 
     # ── Strategy 1: Large-scale geographic name analysis ──
     # Only consider significant locations (level 0-1, or macro types like 洲/国/域)
-    _MACRO_TYPE_KW = ("洲", "国", "域", "界", "大陆", "大海", "海", "部洲")
-
     loc_lookup: dict[str, dict] = {}
     if locations:
         loc_lookup = {loc["name"]: loc for loc in locations}
@@ -1411,11 +1421,10 @@ def _detect_narrative_axis(
         level = info.get("level", 99)
         if level <= 1:
             return True
-        if any(kw in loc_type for kw in _MACRO_TYPE_KW):
-            return True
-        if any(kw in name for kw in _MACRO_TYPE_KW):
-            return True
-        return False
+        return (
+            _MACRO_TYPE_RE.search(loc_type) is not None
+            or _MACRO_TYPE_RE.search(name) is not None
+        )
 
     east_chapters: list[int] = []
     west_chapters: list[int] = []
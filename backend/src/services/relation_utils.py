@@ -5,6 +5,8 @@ Used by entity_aggregator and visualization_service.
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 # ── Relation type normalization mapping ──
 _RELATION_TYPE_NORM: dict[str, str] = {
     # Blood relations — parent-child
@@ -67,8 +69,13 @@ _RELATION_TYPE_NORM: dict[str, str] = {
 }
 
 
+@lru_cache(maxsize=4096)
 def normalize_relation_type(raw: str) -> str:
-    """Normalize a relation type string. Exact match -> contains match -> as-is."""
+    """Normalize a relation type string. Exact match -> contains match -> as-is.
+
+    Memoised: a novel uses a small vocabulary of raw types, and a miss on the
+    exact table otherwise scans every key as a substring.
+    """
     if raw in _RELATION_TYPE_NORM:
         return _RELATION_TYPE_NORM[raw]
     for key, norm in _RELATION_TYPE_NORM.items():
@@ -112,6 +119,7 @@ _RELATION_CATEGORY: dict[str, str] = {
 }
 
 
+@lru_cache(maxsize=4096)
 def classify_relation_category(normalized_type: str) -> str:
     """Classify a normalized relation type into a category."""
     if normalized_type in _RELATION_CATEGORY:
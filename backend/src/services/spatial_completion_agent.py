@@ -20,6 +20,7 @@ from collections import Counter, defaultdict
 from pathlib import Path
 
 from src.db import world_structure_store
+from src.db.chapter_fact_store import read_fact_rows
 from src.db.sqlite_db import get_connection
 from src.infra.context_budget import get_budget
 from src.infra.llm_client import get_llm_client
@@ -227,14 +228,7 @@ class SpatialCompletionAgent:
                 """,
                 (self.novel_id,),
             )
-            rows = await cursor.fetchall()
-            facts = []
-            for row in rows:
-                data = json.loads(row["fact_json"])
-                data["chapter_id"] = row["chapter_num"]
-                data["novel_id"] = self.novel_id
-                facts.append(ChapterFact.model_validate(data))
-            return facts
+            return await read_fact_rows(cursor, self.novel_id)
         finally:
             await conn.close()
 
@@ -320,7 +314,7 @@ class SpatialCompletionAgent:
                 a, b = path[i]["location"], path[i + 1]["location"]
                 if a == b:
                     continue
-                pair = tuple(sorted([a, b]))
+                pair = (a, b) if a <= b else (b, a)
                 if pair in seen_pairs or pair in existing_pairs:
                     continue
                 # Tier gap check
@@ -351,7 +345,7 @@ class SpatialCompletionAgent:
             for i in range(len(children)):
                 for j in range(i + 1, len(children)):
                     a, b = children[i], children[j]
-                    pair = tuple(sorted([a, b]))
+                    pair = (a, b) if a <= b else (b, a)
                     if pair in seen_pairs or pair in existing_pairs:
                         continue
                     # Co-occurrence threshold
@@ -374,7 +368,7 @@ class SpatialCompletionAgent:
         for (a, b), co in top_pairs:
             if co < 2:
                 break
-            pair = tuple(sorted([a, b]))
+            pair = (a, b) if a <= b else (b, a)
             if pair in seen_pairs or pair in existing_pairs:
                 continue
             # Tier gap check
@@ -7,12 +7,21 @@ All functions accept chapter_start/chapter_end to filter by range.
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import json
 import logging
-from collections import Counter, defaultdict
+import re
+import time
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 
-from src.db.sqlite_db import get_connection
+from src.db.chapter_fact_store import FACT_FETCH_CHUNK, read_fact_rows
+from src.db.sqlite_db import acquire_connection, release_connection
 from src.models.chapter_fact import ChapterFact
 from src.db import world_structure_store
 from src.infra.config import DATA_DIR
@@ -32,7 +41,7 @@ from src.services.map_layout_service import (
     layout_to_list,
     place_unresolved_near_neighbors,
 )
-from src.services.alias_resolver import build_alias_map
+from src.services.alias_resolver import alias_generation, build_alias_map
 from src.services.geo_resolver import (
     auto_resolve as geo_auto_resolve,
     place_unresolved_geo_coords,
@@ -44,17 +53,58 @@ from src.services.conflict_detector import (
     _detect_distance_conflicts,
 )
 from src.services.relation_utils import normalize_relation_type
+from src.utils import fast_json
+from src.utils.topology_metrics import parent_chain_depths
 from src.services.world_structure_agent import WorldStructureAgent
-from src.models.world_structure import LayerType
+from src.models.world_structure import LayerType, MapLayer
 
 logger = logging.getLogger(__name__)
 
 
+# Per-scope memo of parsed facts keyed by (novel_id, start, end). Only active
+# inside shared_fact_scope(); outside it every call hits the DB as before.
+_facts_scope: ContextVar[dict[tuple[str, int, int], asyncio.Future] | None] = (
+    ContextVar("_facts_scope", default=None)
+)
+
+
+@contextlib.contextmanager
+def shared_fact_scope():
+    """Share parsed ChapterFacts between views built in the same scope.
+
+    Concurrent callers asking for the same range await one in-flight load.
+    """
+    token = _facts_scope.set({})
+    try:
+        yield
+    finally:
+        _facts_scope.reset(token)
+
+
 async def _load_facts_in_range(
     novel_id: str, chapter_start: int, chapter_end: int
 ) -> list[ChapterFact]:
     """Load ChapterFacts within the given chapter range."""
-    conn = await get_connection()
+    memo = _facts_scope.get()
+    if memo is None:
+        return await _fetch_facts_in_range(novel_id, chapter_start, chapter_end)
+    key = (novel_id, chapter_start, chapter_end)
+    fut = memo.get(key)
+    if fut is None:
+        fut = asyncio.ensure_future(
+            _fetch_facts_in_range(novel_id, chapter_start, chapter_end)
+        )
+        memo[key] = fut
+    return list(await fut)
+
+
+_FACT_FETCH_CHUNK = FACT_FETCH_CHUNK
+
+
+async def _fetch_facts_in_range(
+    novel_id: str, chapter_start: int, chapter_end: int
+) -> list[ChapterFact]:
+    conn = await acquire_connection()
     try:
         cursor = await conn.execute(
             """
@@ -66,35 +116,45 @@ async def _load_facts_in_range(
             """,
             (novel_id, chapter_start, chapter_end),
         )
-        rows = await cursor.fetchall()
-        facts: list[ChapterFact] = []
-        for row in rows:
-            data = json.loads(row["fact_json"])
-            data["chapter_id"] = row["chapter_num"]
-            data["novel_id"] = novel_id
-            facts.append(ChapterFact.model_validate(data))
-        return facts
+        # Visualization views only read facts, so parsed facts are shared
+        return await read_fact_rows(
+            cursor, novel_id, _FACT_FETCH_CHUNK, shared=True,
+        )
     finally:
-        await conn.close()
+        await release_connection(conn)
 
 
 async def _get_earlier_location_names(
     novel_id: str, first_chapter: int, before_chapter: int,
 ) -> set[str]:
-    """Get location names from chapters before the given chapter number."""
+    """Get location names from chapters before the given chapter number.
+
+    Only the names are needed, so SQLite's JSON functions pull them out of
+    fact_json directly instead of loading and validating whole facts.
+    """
     if before_chapter <= first_chapter:
         return set()
-    facts = await _load_facts_in_range(novel_id, first_chapter, before_chapter - 1)
-    names: set[str] = set()
-    for fact in facts:
-        for loc in fact.locations:
-            names.add(loc.name)
-    return names
+    conn = await acquire_connection()
+    try:
+        cursor = await conn.execute(
+            """
+            SELECT DISTINCT json_extract(loc.value, '$.name') AS name
+            FROM chapter_facts cf
+            JOIN chapters c ON cf.chapter_id = c.id AND cf.novel_id = c.novel_id,
+                 json_each(cf.fact_json, '$.locations') AS loc
+            WHERE cf.novel_id = ? AND c.chapter_num >= ? AND c.chapter_num < ?
+              AND json_type(loc.value, '$.name') = 'text'
+            """,
+            (novel_id, first_chapter, before_chapter),
+        )
+        return {row["name"] for row in await cursor.fetchall()}
+    finally:
+        await release_connection(conn)
 
 
 async def get_analyzed_range(novel_id: str) -> tuple[int, int]:
     """Get the first and last analyzed chapter numbers."""
-    conn = await get_connection()
+    conn = await acquire_connection()
     try:
         cursor = await conn.execute(
             """
@@ -110,7 +170,56 @@ async def get_analyzed_range(novel_id: str) -> tuple[int, int]:
             return (row["first_ch"], row["last_ch"])
         return (0, 0)
     finally:
-        await conn.close()
+        await release_connection(conn)
+
+
+# ── View response cache (graph / timeline / factions) ──────────
+
+# (view, novel_id, chapter_start, chapter_end) → (version, data), LRU order
+_view_cache: OrderedDict[tuple[str, str, int, int], tuple[tuple, dict]] = OrderedDict()
+_VIEW_CACHE_MAX = 64
+
+
+async def _facts_version(novel_id: str) -> tuple[int, int, int]:
+    """Cheap change detector for a novel's chapter_facts rows.
+
+    ids are AUTOINCREMENT (never reused) and INSERT OR REPLACE assigns a new
+    one, so any insert, re-extraction or delete changes (MAX(id), COUNT(*)).
+    Scenes are written by a later UPDATE (update_scenes) that keeps the id,
+    so the number of rows with scenes_json is part of the version too. The
+    NULL test reads only the record header, never fact_json or scenes_json.
+    """
+    conn = await acquire_connection()
+    try:
+        cursor = await conn.execute(
+            "SELECT MAX(id), COUNT(*), COUNT(scenes_json) FROM chapter_facts "
+            "WHERE novel_id = ?",
+            (novel_id,),
+        )
+        max_id, count, with_scenes = await cursor.fetchone()
+        return (max_id or 0, count, with_scenes)
+    finally:
+        await release_connection(conn)
+
+
+async def _cached_view(view: str, build, novel_id: str, chapter_start: int, chapter_end: int) -> dict:
+    """Serve a view from ``_view_cache`` while its facts and aliases are unchanged.
+
+    The version is read before building, so a write racing the build makes
+    the next call rebuild. Hits return a shallow copy, like get_map_data.
+    """
+    version = (await _facts_version(novel_id), alias_generation(novel_id))
+    key = (view, novel_id, chapter_start, chapter_end)
+    entry = _view_cache.get(key)
+    if entry is not None and entry[0] == version:
+        _view_cache.move_to_end(key)
+        return dict(entry[1])
+
+    data = await build(novel_id, chapter_start, chapter_end)
+    _view_cache[key] = (version, data)
+    while len(_view_cache) > _VIEW_CACHE_MAX:
+        _view_cache.popitem(last=False)
+    return dict(data)
 
 
 # ── Graph (Person Relationship Network) ──────────
@@ -118,6 +227,12 @@ async def get_analyzed_range(novel_id: str) -> tuple[int, int]:
 
 async def get_graph_data(
     novel_id: str, chapter_start: int, chapter_end: int
+) -> dict:
+    return await _cached_view("graph", _build_graph_data, novel_id, chapter_start, chapter_end)
+
+
+async def _build_graph_data(
+    novel_id: str, chapter_start: int, chapter_end: int
 ) -> dict:
     from src.services.relation_utils import classify_relation_category
     from src.services.name_authority import (
@@ -171,80 +286,18 @@ async def get_graph_data(
             return True
         return False
 
-    # Collect person nodes
-    person_chapters: dict[str, set[int]] = defaultdict(set)
-    person_org: dict[str, str] = {}
-    # Track all aliases seen per canonical name
-    person_aliases: dict[str, set[str]] = defaultdict(set)
-
-    # Collect edges (person_a, person_b) -> relation info
-    edge_map: dict[tuple[str, str], dict] = {}
-
-    # ── Org attribution: collect from org_events + org-type locations ──
-    _ORG_ACTION_JOIN = {"加入", "晋升", "出现", "创建", "成立"}
-    org_locations: set[str] = set()  # location names that are org-like
-    person_org_visits: dict[str, Counter] = defaultdict(Counter)  # person → org → visit count
-
-    for fact in facts:
-        ch = fact.chapter_id
+    # The same names recur in every chapter; decide each one once.
+    skip_cache: dict[str, bool] = {}
 
-        for char in fact.characters:
-            if _skip_person_name(char.name):
-                continue
-            canonical = alias_map.get(char.name, char.name)
-            person_chapters[canonical].add(ch)
-            if char.name != canonical:
-                person_aliases[canonical].add(char.name)
+    def _skip(name: str) -> bool:
+        skip = skip_cache.get(name)
+        if skip is None:
+            skip = skip_cache[name] = _skip_person_name(name)
+        return skip
 
-        # Track org membership from org_events
-        for oe in fact.org_events:
-            if oe.member and oe.action in _ORG_ACTION_JOIN:
-                member = alias_map.get(oe.member, oe.member)
-                org = alias_map.get(oe.org_name, oe.org_name)
-                person_org[member] = org
-
-        # Identify org-type locations
-        for loc in fact.locations:
-            loc_canonical = alias_map.get(loc.name, loc.name)
-            if _is_org_type(loc.type):
-                org_locations.add(loc_canonical)
-
-        # Track character visits to org-type locations
-        for char in fact.characters:
-            if _skip_person_name(char.name):
-                continue
-            canonical = alias_map.get(char.name, char.name)
-            for loc_name in char.locations_in_chapter:
-                loc_canonical = alias_map.get(loc_name, loc_name)
-                if loc_canonical in org_locations:
-                    person_org_visits[canonical][loc_canonical] += 1
-
-        for rel in fact.relationships:
-            if _skip_person_name(rel.person_a) or _skip_person_name(rel.person_b):
-                continue
-            a = alias_map.get(rel.person_a, rel.person_a)
-            b = alias_map.get(rel.person_b, rel.person_b)
-            if a == b:
-                continue  # skip self-relations caused by alias
-            key = tuple(sorted([a, b]))
-            if key not in edge_map:
-                edge_map[key] = {
-                    "source": key[0],
-                    "target": key[1],
-                    "type_counts": Counter(),
-                    "chapters": set(),
-                }
-            edge_map[key]["chapters"].add(ch)
-            normalized = normalize_relation_type(rel.relation_type)
-            edge_map[key]["type_counts"][normalized] += 1
-
-    # ── Fallback org attribution from location visits ──
-    for person, org_counts in person_org_visits.items():
-        if person not in person_org and org_counts:
-            # Assign to the org-location visited most frequently
-            best_org = org_counts.most_common(1)[0][0]
-            if org_counts[best_org] >= 2:  # require ≥ 2 visits
-                person_org[person] = best_org
+    person_chapters, person_org, person_aliases, edge_map = await asyncio.to_thread(
+        _aggregate_graph_facts, facts, alias_map, _skip,
+    )
 
     from src.services.alias_resolver import get_override_targets
     from src.services.hallucination_filter import get_ungrounded_persons
@@ -260,11 +313,6 @@ async def get_graph_data(
             person_chapters.pop(name, None)
             person_org.pop(name, None)
             person_aliases.pop(name, None)
-        edge_map = {
-            k: v
-            for k, v in edge_map.items()
-            if k[0] not in ungrounded and k[1] not in ungrounded
-        }
 
     override_targets = await get_override_targets(novel_id)
     nodes = [
@@ -274,42 +322,51 @@ async def get_graph_data(
             "type": "person",
             "chapter_count": len(chs),
             "org": person_org.get(name, ""),
-            "aliases": sorted(person_aliases.get(name, set())),
+            "aliases": sorted(person_aliases.get(name, ())),
             "edit_status": "edited" if name in override_targets else "",
         }
         for name, chs in person_chapters.items()
     ]
-    nodes.sort(key=lambda n: -n["chapter_count"])
+    nodes.sort(key=itemgetter("chapter_count"), reverse=True)
 
+    # One pass builds the edges (dropping ungrounded endpoints) together with
+    # the category/type stats and the max weight.
     edges_out: list[dict] = []
     category_counts: Counter = Counter()
-    for e in edge_map.values():
-        primary_type = e["type_counts"].most_common(1)[0][0]
+    # Relation type stats for frontend display
+    type_counts: Counter = Counter()
+    max_weight = 1
+    for (source, target), e in edge_map.items():
+        if ungrounded and (source in ungrounded or target in ungrounded):
+            continue
+        # Ranked once; the first entry is the primary type (ties keep
+        # first-seen order, as most_common(1) does)
+        all_types = [t for t, _ in e["type_counts"].most_common()]
+        primary_type = all_types[0]
         category = classify_relation_category(primary_type)
         category_counts[category] += 1
+        type_counts[primary_type] += 1
+        chapters = e["chapters"]
+        weight = len(chapters)
+        if weight > max_weight:
+            max_weight = weight
         edges_out.append({
-            "source": e["source"],
-            "target": e["target"],
+            "source": source,
+            "target": target,
             "relation_type": primary_type,
-            "all_types": [t for t, _ in e["type_counts"].most_common()],
-            "weight": len(e["chapters"]),
-            "chapters": sorted(e["chapters"]),
+            "all_types": all_types,
+            "weight": weight,
+            "chapters": sorted(chapters),
             "category": category,
         })
 
     # Compute a suggested min_edge_weight for large graphs
-    max_weight = max((e["weight"] for e in edges_out), default=1)
     suggested_min_edge = 1
     if len(edges_out) > 500:
         suggested_min_edge = 2
     if len(edges_out) > 2000:
         suggested_min_edge = max(3, max_weight // 10)
 
-    # Relation type stats for frontend display
-    type_counts: Counter = Counter()
-    for e in edges_out:
-        type_counts[e["relation_type"]] += 1
-
     return {
         "nodes": nodes,
         "edges": edges_out,
@@ -321,6 +378,90 @@ async def get_graph_data(
     }
 
 
+def _aggregate_graph_facts(
+    facts: list[ChapterFact],
+    alias_map: dict[str, str],
+    skip: Callable[[str], bool],
+) -> tuple[dict[str, set[int]], dict[str, str], dict[str, set[str]], dict[tuple[str, str], dict]]:
+    """Walk ``facts`` once for the person graph.
+
+    Returns (person_chapters, person_org, person_aliases, edge_map). Pure
+    CPU work on already-loaded facts, so get_graph_data runs it off the
+    event loop. Chapters are walked in order: org-typed locations count for
+    visits from the chapter they first appear in, and later org_events win.
+    """
+    # Collect person nodes
+    person_chapters: dict[str, set[int]] = defaultdict(set)
+    person_org: dict[str, str] = {}
+    # Track all aliases seen per canonical name
+    person_aliases: dict[str, set[str]] = defaultdict(set)
+
+    # Collect edges (person_a, person_b) -> relation info
+    edge_map: dict[tuple[str, str], dict] = {}
+
+    # ── Org attribution: collect from org_events + org-type locations ──
+    _ORG_ACTION_JOIN = {"加入", "晋升", "出现", "创建", "成立"}
+    org_locations: set[str] = set()  # location names that are org-like
+    person_org_visits: dict[str, Counter] = defaultdict(Counter)  # person → org → visit count
+
+    resolve = alias_map.get
+    edge_get = edge_map.get
+
+    for fact in facts:
+        ch = fact.chapter_id
+
+        # Track org membership from org_events
+        for oe in fact.org_events:
+            if oe.member and oe.action in _ORG_ACTION_JOIN:
+                person_org[resolve(oe.member, oe.member)] = resolve(oe.org_name, oe.org_name)
+
+        # Identify org-type locations (before visits, so this chapter counts)
+        for loc in fact.locations:
+            if _is_org_type(loc.type):
+                org_locations.add(resolve(loc.name, loc.name))
+
+        # Chapter presence, aliases and visits to org-type locations
+        for char in fact.characters:
+            name = char.name
+            if skip(name):
+                continue
+            canonical = resolve(name, name)
+            person_chapters[canonical].add(ch)
+            if name != canonical:
+                person_aliases[canonical].add(name)
+            visits = None
+            for loc_name in char.locations_in_chapter:
+                loc_canonical = resolve(loc_name, loc_name)
+                if loc_canonical in org_locations:
+                    if visits is None:
+                        visits = person_org_visits[canonical]
+                    visits[loc_canonical] += 1
+
+        for rel in fact.relationships:
+            if skip(rel.person_a) or skip(rel.person_b):
+                continue
+            a = resolve(rel.person_a, rel.person_a)
+            b = resolve(rel.person_b, rel.person_b)
+            if a == b:
+                continue  # skip self-relations caused by alias
+            key = (a, b) if a < b else (b, a)
+            edge = edge_get(key)
+            if edge is None:
+                edge = edge_map[key] = {"type_counts": Counter(), "chapters": set()}
+            edge["chapters"].add(ch)
+            edge["type_counts"][normalize_relation_type(rel.relation_type)] += 1
+
+    # ── Fallback org attribution from location visits ──
+    for person, org_counts in person_org_visits.items():
+        if person not in person_org and org_counts:
+            # Assign to the org-location visited most frequently
+            best_org = org_counts.most_common(1)[0][0]
+            if org_counts[best_org] >= 2:  # require ≥ 2 visits
+                person_org[person] = best_org
+
+    return person_chapters, person_org, person_aliases, edge_map
+
+
 # ── Map (Location Hierarchy + Trajectories) ──────
 
 
@@ -519,6 +660,10 @@ _CHINESE_DIRECTION_MAP = {
     "东北方": "northeast_of", "西北方": "northwest_of",
     "东南方": "southeast_of", "西南方": "southwest_of",
 }
+# Leftmost match, longest alternative first, so 东北 wins over 北.
+_CHINESE_DIRECTION_RE = re.compile(
+    "|".join(map(re.escape, sorted(_CHINESE_DIRECTION_MAP, key=len, reverse=True)))
+)
 
 
 def _clean_spatial_constraints(
@@ -530,6 +675,10 @@ def _clean_spatial_constraints(
     1. Fix inverted contains relationships using hierarchy levels.
     2. Normalize Chinese direction values to English enum.
     3. Remove constraints with invalid/unparseable values.
+    4. Drop duplicates that become identical after fixing (e.g. A⊃B and an
+       inverted B⊃A), keeping the most confident at the first position.
+
+    Fixes are applied to the constraint dicts in place.
     """
     # Build lookup tables
     loc_level = {loc["name"]: loc.get("level", 0) for loc in locations}
@@ -558,13 +707,13 @@ def _clean_spatial_constraints(
             # Check if source is actually a child of target (inverted)
             if loc_parent.get(src) == tgt:
                 # Swap: target should contain source
-                c = {**c, "source": tgt, "target": src}
+                c["source"], c["target"] = tgt, src
                 fixed += 1
             elif loc_parent.get(tgt) == src:
                 pass  # Correct: source contains target
             elif src_level > tgt_level:
                 # Higher level = deeper in hierarchy = smaller area → likely inverted
-                c = {**c, "source": tgt, "target": src}
+                c["source"], c["target"] = tgt, src
                 fixed += 1
 
             cleaned.append(c)
@@ -577,12 +726,11 @@ def _clean_spatial_constraints(
                 cleaned.append(c)
                 continue
             # Try Chinese mapping
-            for zh, en in _CHINESE_DIRECTION_MAP.items():
-                if zh in value:
-                    c = {**c, "value": en}
-                    fixed += 1
-                    cleaned.append(c)
-                    break
+            m = _CHINESE_DIRECTION_RE.search(value)
+            if m:
+                c["value"] = _CHINESE_DIRECTION_MAP[m.group(0)]
+                fixed += 1
+                cleaned.append(c)
             else:
                 # Unparseable direction value — drop
                 removed += 1
@@ -591,12 +739,27 @@ def _clean_spatial_constraints(
         # Other relation types: keep as-is
         cleaned.append(c)
 
-    if fixed or removed or dangling:
+    # ── Dedup on the canonical signature produced by the fixes above ──
+    by_sig: dict[tuple, int] = {}
+    deduped: list[dict] = []
+    for c in cleaned:
+        sig = (c["relation_type"], c["source"], c["target"], c.get("value"))
+        idx = by_sig.get(sig)
+        if idx is None:
+            by_sig[sig] = len(deduped)
+            deduped.append(c)
+        elif _CONFIDENCE_RANK.get(c.get("confidence"), 1) > _CONFIDENCE_RANK.get(
+            deduped[idx].get("confidence"), 1
+        ):
+            deduped[idx] = c
+    duplicates = len(cleaned) - len(deduped)
+
+    if fixed or removed or dangling or duplicates:
         logger.info(
-            "Constraint cleaning: fixed %d, removed %d, dangling %d, kept %d",
-            fixed, removed, dangling, len(cleaned),
+            "Constraint cleaning: fixed %d, removed %d, dangling %d, duplicates %d, kept %d",
+            fixed, removed, dangling, duplicates, len(deduped),
         )
-    return cleaned
+    return deduped
 
 
 # ── Direction opposites for contradiction detection ──
@@ -790,89 +953,121 @@ def _enhance_constraints(
     return spatial_constraints
 
 
-_map_cache: dict[str, tuple[float, dict]] = {}  # key → (timestamp, data)
+# (novel_id, chapter_start, chapter_end, layer_id) → (timestamp, data), LRU order
+_map_cache: OrderedDict[tuple[str, int, int, str], tuple[float, dict]] = OrderedDict()
+# cache key → [lock, callers holding or waiting on it]; dropped with the last
+_map_cache_locks: dict[tuple[str, int, int, str], list] = {}
 _MAP_CACHE_TTL = 300  # 5 minutes
+_MAP_CACHE_MAX = 64
 
-async def get_map_data(
-    novel_id: str, chapter_start: int, chapter_end: int,
-    layer_id: str | None = None,
-) -> dict:
-    import time as _time
-    cache_key = f"{novel_id}:{chapter_start}:{chapter_end}:{layer_id or ''}"
-    if cache_key in _map_cache:
-        ts, cached = _map_cache[cache_key]
-        if _time.time() - ts < _MAP_CACHE_TTL:
-            return cached
 
-    facts = await _load_facts_in_range(novel_id, chapter_start, chapter_end)
+# (novel_id, chapter_start, chapter_end) → (timestamp, aggregate), LRU order.
+# Shared by every layer_id of a range, so switching layers skips the fact
+# load and aggregation.
+_fact_agg_cache: OrderedDict[tuple[str, int, int], tuple[float, "_MapFactAggregate"]] = OrderedDict()
+_fact_agg_generation: dict[str, int] = {}
+_FACT_AGG_CACHE_MAX = 16
 
-    loc_info: dict[str, dict] = {}
-    loc_chapters: dict[str, set[int]] = defaultdict(set)
-    trajectories: dict[str, list[dict]] = defaultdict(list)
-    # Spatial constraint aggregation: (source, target, relation_type) -> best entry
-    constraint_map: dict[tuple[str, str, str], dict] = {}
 
-    # Track the "best" role per location: setting > boundary > referenced > None
-    _ROLE_PRIORITY = {"setting": 3, "boundary": 2, "referenced": 1}
-    loc_role: dict[str, str | None] = {}
+def invalidate_map_cache(novel_id: str) -> None:
+    """Drop all cached map/view responses and fact aggregates for a novel."""
+    for k in [k for k in _map_cache if k[0] == novel_id]:
+        del _map_cache[k]
+    for k in [k for k in _view_cache if k[1] == novel_id]:
+        del _view_cache[k]
+    for k in [k for k in _fact_agg_cache if k[0] == novel_id]:
+        del _fact_agg_cache[k]
+    _fact_agg_generation[novel_id] = _fact_agg_generation.get(novel_id, 0) + 1
 
-    for fact in facts:
-        ch = fact.chapter_id
 
-        for loc in fact.locations:
-            loc_chapters[loc.name].add(ch)
-            if loc.name not in loc_info:
-                loc_info[loc.name] = {
-                    "name": loc.name,
-                    "type": loc.type,
-                    "parent": loc.parent,
-                }
-            elif loc.parent and not loc_info[loc.name]["parent"]:
-                loc_info[loc.name]["parent"] = loc.parent
-            # Upgrade role to most significant seen
-            new_role = loc.role
-            if new_role:
-                cur = loc_role.get(loc.name)
-                if cur is None or _ROLE_PRIORITY.get(new_role, 0) > _ROLE_PRIORITY.get(cur, 0):
-                    loc_role[loc.name] = new_role
+async def _load_map_fact_aggregate(
+    novel_id: str, chapter_start: int, chapter_end: int,
+) -> "_MapFactAggregate":
+    """Return a private copy of the fact aggregate for a chapter range."""
+    key = (novel_id, chapter_start, chapter_end)
+    entry = _fact_agg_cache.get(key)
+    if entry is not None:
+        ts, agg = entry
+        if time.time() - ts < _MAP_CACHE_TTL:
+            _fact_agg_cache.move_to_end(key)
+            return agg.copy()
+        del _fact_agg_cache[key]
+
+    generation = _fact_agg_generation.get(novel_id, 0)
+    facts = await _load_facts_in_range(novel_id, chapter_start, chapter_end)
+    agg = _aggregate_map_facts(facts)
+    # An invalidation during the load means the facts may already be stale
+    if _fact_agg_generation.get(novel_id, 0) == generation:
+        _fact_agg_cache[key] = (time.time(), agg)
+        while len(_fact_agg_cache) > _FACT_AGG_CACHE_MAX:
+            _fact_agg_cache.popitem(last=False)
+    return agg.copy()
 
-        # Build trajectories from characters' locations_in_chapter
-        for char in fact.characters:
-            for loc_name in char.locations_in_chapter:
-                trajectories[char.name].append({
-                    "location": loc_name,
-                    "chapter": ch,
-                })
 
-        # Aggregate spatial relationships
-        for sr in fact.spatial_relationships:
-            key = (sr.source, sr.target, sr.relation_type)
-            new_rank = _CONFIDENCE_RANK.get(sr.confidence, 1)
-            existing = constraint_map.get(key)
-            if existing is None or new_rank > _CONFIDENCE_RANK.get(existing["confidence"], 1):
-                constraint_map[key] = {
-                    "source": sr.source,
-                    "target": sr.target,
-                    "relation_type": sr.relation_type,
-                    "value": sr.value,
-                    "confidence": sr.confidence,
-                    "narrative_evidence": sr.narrative_evidence,
-                    "distance_class": sr.distance_class,
-                    "confidence_score": sr.confidence_score,
-                    "waypoints": sr.waypoints,
-                }
+async def get_map_data(
+    novel_id: str, chapter_start: int, chapter_end: int,
+    layer_id: str | None = None,
+) -> dict:
+    """Return map data, serving repeat requests from an in-process LRU.
+
+    Concurrent requests for the same key wait on a per-key lock so the
+    response is only built once. Hits return a shallow copy so callers can
+    add top-level keys (e.g. ``analyzed_range``) without touching the cache.
+    """
+    cache_key = (novel_id, chapter_start, chapter_end, layer_id or "")
+    slot = _map_cache_locks.get(cache_key)
+    if slot is None:
+        slot = _map_cache_locks[cache_key] = [asyncio.Lock(), 0]
+    slot[1] += 1
+    try:
+        async with slot[0]:
+            entry = _map_cache.get(cache_key)
+            if entry is not None:
+                ts, cached = entry
+                if time.time() - ts < _MAP_CACHE_TTL:
+                    _map_cache.move_to_end(cache_key)
+                    return dict(cached)
+                del _map_cache[cache_key]
+
+            result = await _build_map_data(novel_id, chapter_start, chapter_end, layer_id)
+
+            _map_cache[cache_key] = (time.time(), result)
+            while len(_map_cache) > _MAP_CACHE_MAX:
+                _map_cache.popitem(last=False)
+    finally:
+        slot[1] -= 1
+        if not slot[1]:
+            del _map_cache_locks[cache_key]
+    return dict(result)
+
+
+async def _build_map_data(
+    novel_id: str, chapter_start: int, chapter_end: int,
+    layer_id: str | None = None,
+) -> dict:
+    # Independent DB round-trips are issued together; failures of the
+    # optional ones are re-raised at their original (guarded) use sites.
+    (
+        agg, overrides_res, ws_res, range_res, alias_res,
+    ) = await asyncio.gather(
+        _load_map_fact_aggregate(novel_id, chapter_start, chapter_end),
+        _load_all_overrides(novel_id),
+        world_structure_store.load(novel_id),
+        get_analyzed_range(novel_id),
+        build_alias_map(novel_id),
+        return_exceptions=True,
+    )
+    # Location/trajectory/constraint aggregation plus the geography context
+    # and conflict-detector input, built in one pass over the facts.
+    agg = _unwrap(agg)
+    loc_info = agg.loc_info
+    loc_chapters = agg.loc_chapters
+    loc_role = agg.loc_role
+    trajectories = agg.trajectories
+    constraint_map = agg.constraint_map
 
     # Calculate hierarchy levels
-    def get_level(name: str, visited: set[str] | None = None) -> int:
-        if visited is None:
-            visited = set()
-        if name in visited:
-            return 0
-        visited.add(name)
-        info = loc_info.get(name)
-        if not info or not info["parent"]:
-            return 0
-        return 1 + get_level(info["parent"], visited)
+    levels = _hierarchy_levels(loc_info)
 
     # Pre-load tier/icon maps from WorldStructure (loaded later, but we need a ref)
     # We'll populate these after ws is loaded; for now default to empty
@@ -885,26 +1080,17 @@ async def get_map_data(
             "name": name,
             "type": info["type"],
             "parent": info["parent"],
-            "level": get_level(name),
-            "mention_count": len(loc_chapters.get(name, set())),
+            "level": levels[name],
+            "mention_count": len(loc_chapters[name]),
             "tier": "city",     # placeholder, updated after ws load
             "icon": "generic",  # placeholder, updated after ws load
             "role": loc_role.get(name),
         }
         for name, info in loc_info.items()
     ]
-    locations.sort(key=lambda l: (-l["mention_count"], l["name"]))
-
-    # Deduplicate trajectories
-    for person in list(trajectories.keys()):
-        seen = set()
-        unique = []
-        for entry in trajectories[person]:
-            key = (entry["location"], entry["chapter"])
-            if key not in seen:
-                seen.add(key)
-                unique.append(entry)
-        trajectories[person] = unique
+    # Stable two-pass sort: name ascending, then mention_count descending
+    locations.sort(key=itemgetter("name"))
+    locations.sort(key=itemgetter("mention_count"), reverse=True)
 
     # Inject travel_path waypoints into trajectories.
     # If character moves A→C and a travel_path exists A→C with waypoints=[B],
@@ -953,10 +1139,19 @@ async def get_map_data(
     spatial_constraints = _clean_spatial_constraints(spatial_constraints, locations)
 
     # Build first-chapter-appearance map for narrative axis
-    first_chapter_map: dict[str, int] = {}
-    for name, chs in loc_chapters.items():
-        if chs:
-            first_chapter_map[name] = min(chs)
+    # (every loc_chapters entry holds at least one chapter)
+    first_chapter_map: dict[str, int] = {
+        name: min(chs) for name, chs in loc_chapters.items()
+    }
+
+    # ── User overrides (positions, locked parents, lat/lng) in one query ──
+    user_overrides: dict[str, tuple[float, float]] = {}
+    locked_parents: dict[str, str] = {}
+    geo_overrides: dict[str, tuple[float, float]] = {}
+    try:
+        user_overrides, locked_parents, geo_overrides = _unwrap(overrides_res)
+    except Exception:
+        logger.warning("Failed to load user overrides", exc_info=True)
 
     # ── Load WorldStructure ──
     region_boundaries: list[dict] = []
@@ -965,10 +1160,14 @@ async def get_map_data(
     ws = None
     ws_summary: dict | None = None
     portals_response: list[dict] = []
+    # layer_id -> first layer with that id (matches the old linear scans)
+    layers_by_id: dict[str, MapLayer] = {}
 
     try:
-        ws = await world_structure_store.load(novel_id)
+        ws = _unwrap(ws_res)
         if ws is not None:
+            for layer in ws.layers:
+                layers_by_id.setdefault(layer.layer_id, layer)
             # Normalize variant location names in WorldStructure maps so they
             # match the canonical forms used in region definitions (e.g.,
             # 南瞻部洲 → 南赡部洲 matches the overworld region).
@@ -977,11 +1176,10 @@ async def get_map_data(
                     # Fix location_region_map: variant key → remap to canonical region
                     if variant in ws.location_region_map:
                         # If canonical region exists, point variant there
-                        overworld_region_names = set()
-                        for layer in ws.layers:
-                            if layer.layer_id == "overworld":
-                                overworld_region_names = {r.name for r in layer.regions}
-                                break
+                        overworld = layers_by_id.get("overworld")
+                        overworld_region_names = (
+                            {r.name for r in overworld.regions} if overworld else set()
+                        )
                         if canonical in overworld_region_names:
                             ws.location_region_map[variant] = canonical
 
@@ -1016,16 +1214,12 @@ async def get_map_data(
                         loc["parent"] = authoritative
 
             # Override parents with user-locked parents (highest priority)
-            try:
-                locked_parents = await _load_locked_parents(novel_id)
-                if locked_parents:
-                    for loc in locations:
-                        locked_p = locked_parents.get(loc["name"])
-                        if locked_p is not None:
-                            loc["parent"] = locked_p
-                            loc["locked"] = True
-            except Exception:
-                logger.warning("Failed to load locked parents", exc_info=True)
+            if locked_parents:
+                for loc in locations:
+                    locked_p = locked_parents.get(loc["name"])
+                    if locked_p is not None:
+                        loc["parent"] = locked_p
+                        loc["locked"] = True
 
             # Recalculate hierarchy levels with updated parents
             if ws.location_parents:
@@ -1033,19 +1227,17 @@ async def get_map_data(
                 for loc in locations:
                     if loc["name"] in loc_info:
                         loc_info[loc["name"]]["parent"] = loc["parent"]
+                levels = _hierarchy_levels(loc_info)
                 for loc in locations:
-                    loc["level"] = get_level(loc["name"])
+                    loc["level"] = levels[loc["name"]]
 
             # Build world_structure summary for API response
             ws_summary = _build_ws_summary(ws)
 
             # Build portals response
             for p in ws.portals:
-                target_layer_name = ""
-                for layer in ws.layers:
-                    if layer.layer_id == p.target_layer:
-                        target_layer_name = layer.name
-                        break
+                target_layer = layers_by_id.get(p.target_layer)
+                target_layer_name = target_layer.name if target_layer else ""
                 portals_response.append({
                     "name": p.name,
                     "source_layer": p.source_layer,
@@ -1058,6 +1250,8 @@ async def get_map_data(
 
             # Auto-generate portal entries for merged layers (≤1 location)
             _existing_portal_targets = {p["target_layer"] for p in portals_response}
+            # First location per layer, built once (merged layers hold ≤1)
+            _layer_first_loc: dict[str, str] | None = None
             for layer_info in ws_summary["layers"]:
                 if not layer_info.get("merged"):
                     continue
@@ -1066,11 +1260,11 @@ async def get_map_data(
                 if layer_info["location_count"] < 1:
                     continue
                 # Find the single location in this layer
-                loc_name = next(
-                    (name for name, lid in ws.location_layer_map.items()
-                     if lid == layer_info["layer_id"]),
-                    None,
-                )
+                if _layer_first_loc is None:
+                    _layer_first_loc = {}
+                    for name, lid in ws.location_layer_map.items():
+                        _layer_first_loc.setdefault(lid, name)
+                loc_name = _layer_first_loc.get(layer_info["layer_id"])
                 if loc_name:
                     portals_response.append({
                         "name": f"进入{layer_info['name']}",
@@ -1333,7 +1527,6 @@ async def get_map_data(
         if not geo_resolved:
             if ws is not None and len(ws.layers) > 1:
                 try:
-                    user_overrides = await _load_user_overrides(novel_id)
                     ws_dict = ws.model_dump()
                     layer_layouts = await asyncio.to_thread(
                         compute_layered_layout,
@@ -1341,11 +1534,10 @@ async def get_map_data(
                         user_overrides, first_chapter_map,
                         spatial_scale=ws.spatial_scale,
                     )
-                    # Cache each layer
-                    for lid, litems in layer_layouts.items():
-                        await _save_cached_layer_layout(
-                            novel_id, lid, ch_hash, litems, "layered",
-                        )
+                    # Cache every layer in one transaction
+                    await _save_cached_layer_layouts(
+                        novel_id, ch_hash, layer_layouts, "layered",
+                    )
                 except Exception:
                     logger.warning("Layered layout computation failed", exc_info=True)
 
@@ -1371,12 +1563,13 @@ async def get_map_data(
                     novel_id, ch_hash, locations, spatial_constraints,
                     first_chapter_map,
                     location_region_bounds=location_region_bounds,
+                    user_overrides=user_overrides,
                 )
 
     # ── Revealed location names for fog of war ──
     revealed_names: list[str] = []
     try:
-        analyzed_first, _ = await get_analyzed_range(novel_id)
+        analyzed_first, _ = _unwrap(range_res)
         if analyzed_first > 0 and chapter_start > analyzed_first:
             earlier_names = await _get_earlier_location_names(
                 novel_id, analyzed_first, chapter_start,
@@ -1386,38 +1579,18 @@ async def get_map_data(
     except Exception:
         logger.warning("Failed to load revealed location names", exc_info=True)
 
-    # ── Geography context: location descriptions + spatial evidence ──
-    geo_context: list[dict] = []
-    for fact in facts:
-        entries: list[dict] = []
-        for loc in fact.locations:
-            if loc.description:
-                entries.append({
-                    "type": "location",
-                    "name": loc.name,
-                    "text": loc.description,
-                })
-        for sr in fact.spatial_relationships:
-            if sr.narrative_evidence:
-                entries.append({
-                    "type": "spatial",
-                    "name": f"{sr.source} → {sr.target}",
-                    "text": sr.narrative_evidence,
-                })
-        if entries:
-            geo_context.append({"chapter": fact.chapter_id, "entries": entries})
+    geo_context = agg.geo_context
+    parsed_for_conflicts = agg.conflict_input
 
     # ── Detect location/direction/distance conflicts (reuse loaded facts, no extra DB query) ──
     location_conflicts: list[dict] = []
     try:
-        parsed_for_conflicts = [
-            (f.chapter_id, f.model_dump()) for f in facts
-        ]
-        alias_map = await build_alias_map(novel_id)
-        raw_conflicts = _detect_location_conflicts(parsed_for_conflicts)
-        raw_conflicts.extend(_detect_direction_conflicts(parsed_for_conflicts, alias_map))
-        raw_conflicts.extend(_detect_distance_conflicts(parsed_for_conflicts, alias_map))
-        location_conflicts = [c.to_dict() for c in raw_conflicts]
+        alias_map = _unwrap(alias_res)
+        # One worker-thread hop for all three rule passes keeps the event
+        # loop free on long novels.
+        location_conflicts = await asyncio.to_thread(
+            _detect_map_conflicts, parsed_for_conflicts, alias_map,
+        )
     except Exception:
         logger.warning("Failed to detect location conflicts for map", exc_info=True)
 
@@ -1437,10 +1610,10 @@ async def get_map_data(
     _is_overworld_like = not layer_id or layer_id == "overworld"
     _is_underwater = False
     if ws and layer_id:
-        for _layer_obj in ws.layers:
-            if _layer_obj.layer_id == layer_id and _layer_obj.layer_type == LayerType.underwater:
-                _is_underwater = True
-                break
+        _layer_obj = layers_by_id.get(layer_id)
+        _is_underwater = (
+            _layer_obj is not None and _layer_obj.layer_type == LayerType.underwater
+        )
     landmass_result: dict = {}
     roads: list[dict] = []
     if layout_mode != "geographic" and len(layout_data) >= 3 and _is_overworld_like and not _is_underwater:
@@ -1580,7 +1753,6 @@ async def get_map_data(
     }
     if geo_coords_raw:
         # Apply user lat/lng overrides on top of auto-resolved coordinates
-        geo_overrides = await _load_geo_overrides(novel_id)
         for loc_name, (lat, lng) in geo_overrides.items():
             geo_coords_raw[loc_name] = {"lat": lat, "lng": lng}
         result["geo_coords"] = geo_coords_raw
@@ -1590,20 +1762,187 @@ async def get_map_data(
         result["world_structure"] = ws_summary
         result["layer_layouts"] = layer_layouts
 
-    # Cache result
-    _map_cache[cache_key] = (_time.time(), result)
     return result
 
 
+def _hierarchy_levels(loc_info: dict[str, dict]) -> dict[str, int]:
+    """Depth of every location in the parent chain, each computed once.
+
+    A location's level is the number of parent hops until a root, a parent
+    missing from ``loc_info``, or an already-walked name (cycle); see
+    ``parent_chain_depths``.
+    """
+    return parent_chain_depths({name: info["parent"] for name, info in loc_info.items()})
+
+
+def _unwrap(result):
+    """Re-raise an exception captured by ``gather(return_exceptions=True)``."""
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+_ROLE_PRIORITY = {"setting": 3, "boundary": 2, "referenced": 1}
+
+
+@dataclass(slots=True)
+class _MapFactAggregate:
+    """Everything ``_build_map_data`` derives from one walk over the facts."""
+
+    loc_info: dict[str, dict]
+    loc_chapters: dict[str, set[int]]
+    loc_role: dict[str, str | None]
+    trajectories: dict[str, list[dict]]
+    # (source, target, relation_type) -> best entry
+    constraint_map: dict[tuple[str, str, str], dict]
+    geo_context: list[dict]
+    # (chapter, dict view) pairs carrying only the keys read by the
+    # location/direction/distance conflict detectors
+    conflict_input: list[tuple[int, dict]]
+
+    def copy(self) -> "_MapFactAggregate":
+        """Copy the parts ``_build_map_data`` mutates (loc_info parents,
+        trajectory lists, constraint entries); the rest is only read."""
+        return _MapFactAggregate(
+            loc_info={k: dict(v) for k, v in self.loc_info.items()},
+            loc_chapters=self.loc_chapters,
+            loc_role=self.loc_role,
+            trajectories=defaultdict(
+                list, {k: list(v) for k, v in self.trajectories.items()}
+            ),
+            constraint_map={k: dict(v) for k, v in self.constraint_map.items()},
+            geo_context=self.geo_context,
+            conflict_input=self.conflict_input,
+        )
+
+
+def _aggregate_map_facts(facts: list[ChapterFact]) -> _MapFactAggregate:
+    """Aggregate locations, trajectories, spatial constraints, geography
+    context and conflict-detector input in a single pass over ``facts``."""
+    loc_info: dict[str, dict] = {}
+    loc_chapters: dict[str, set[int]] = defaultdict(set)
+    trajectories: dict[str, list[dict]] = defaultdict(list)
+    # person -> (location, chapter) already in their trajectory
+    trajectory_seen: dict[str, set[tuple[str, int]]] = defaultdict(set)
+    constraint_map: dict[tuple[str, str, str], dict] = {}
+    # Track the "best" role per location: setting > boundary > referenced > None
+    loc_role: dict[str, str | None] = {}
+    geo_context: list[dict] = []
+    conflict_input: list[tuple[int, dict]] = []
+
+    for fact in facts:
+        ch = fact.chapter_id
+        entries: list[dict] = []
+        conflict_locs: list[dict] = []
+        conflict_srs: list[dict] = []
+
+        for loc in fact.locations:
+            name = loc.name
+            loc_chapters[name].add(ch)
+            conflict_locs.append({"name": name, "parent": loc.parent})
+            if loc.description:
+                entries.append({
+                    "type": "location",
+                    "name": name,
+                    "text": loc.description,
+                })
+            info = loc_info.get(name)
+            if info is None:
+                loc_info[name] = {
+                    "name": name,
+                    "type": loc.type,
+                    "parent": loc.parent,
+                }
+            elif loc.parent and not info["parent"]:
+                info["parent"] = loc.parent
+            # Upgrade role to most significant seen
+            new_role = loc.role
+            if new_role:
+                cur = loc_role.get(name)
+                if cur is None or _ROLE_PRIORITY.get(new_role, 0) > _ROLE_PRIORITY.get(cur, 0):
+                    loc_role[name] = new_role
+
+        # Build trajectories from characters' locations_in_chapter,
+        # keeping only the first visit per (location, chapter)
+        for char in fact.characters:
+            visits = char.locations_in_chapter
+            if not visits:
+                continue
+            name = char.name
+            seen = trajectory_seen[name]
+            path = trajectories[name]
+            for loc_name in visits:
+                key = (loc_name, ch)
+                if key not in seen:
+                    seen.add(key)
+                    path.append({"location": loc_name, "chapter": ch})
+
+        # Aggregate spatial relationships
+        for sr in fact.spatial_relationships:
+            source, target = sr.source, sr.target
+            conflict_srs.append({
+                "source": source,
+                "target": target,
+                "relation_type": sr.relation_type,
+                "value": sr.value,
+                "distance_class": sr.distance_class,
+            })
+            if sr.narrative_evidence:
+                entries.append({
+                    "type": "spatial",
+                    "name": f"{source} → {target}",
+                    "text": sr.narrative_evidence,
+                })
+            key = (source, target, sr.relation_type)
+            new_rank = _CONFIDENCE_RANK.get(sr.confidence, 1)
+            existing = constraint_map.get(key)
+            if existing is None or new_rank > _CONFIDENCE_RANK.get(existing["confidence"], 1):
+                constraint_map[key] = {
+                    "source": source,
+                    "target": target,
+                    "relation_type": sr.relation_type,
+                    "value": sr.value,
+                    "confidence": sr.confidence,
+                    "narrative_evidence": sr.narrative_evidence,
+                    "distance_class": sr.distance_class,
+                    "confidence_score": sr.confidence_score,
+                    "waypoints": sr.waypoints,
+                }
+
+        conflict_input.append(
+            (ch, {"locations": conflict_locs, "spatial_relationships": conflict_srs})
+        )
+        if entries:
+            geo_context.append({"chapter": ch, "entries": entries})
+
+    return _MapFactAggregate(
+        loc_info=loc_info,
+        loc_chapters=loc_chapters,
+        loc_role=loc_role,
+        trajectories=trajectories,
+        constraint_map=constraint_map,
+        geo_context=geo_context,
+        conflict_input=conflict_input,
+    )
+
+
+def _detect_map_conflicts(
+    parsed: list[tuple[int, dict]], alias_map: dict[str, str],
+) -> list[dict]:
+    """Run the location/direction/distance detectors; pure, thread-safe."""
+    raw_conflicts = _detect_location_conflicts(parsed)
+    raw_conflicts.extend(_detect_direction_conflicts(parsed, alias_map))
+    raw_conflicts.extend(_detect_distance_conflicts(parsed, alias_map))
+    return [c.to_dict() for c in raw_conflicts]
+
+
 def _build_ws_summary(ws) -> dict:
     """Build a concise world_structure summary for the API response."""
     layer_summaries = []
+    # Count locations assigned to each layer in one pass
+    layer_loc_counts = Counter(ws.location_layer_map.values())
     for layer in ws.layers:
-        # Count locations assigned to this layer
-        loc_count = sum(
-            1 for lid in ws.location_layer_map.values()
-            if lid == layer.layer_id
-        )
+        loc_count = layer_loc_counts.get(layer.layer_id, 0)
         # Merge layers with ≤1 location into the main world (except overworld)
         merged = (
             layer.layer_id != "overworld"
@@ -1636,38 +1975,64 @@ async def _save_cached_layer_layout(
     """Cache a layer layout to the layer_layouts table."""
     await world_structure_store.save_layer_layout(
         novel_id, layer_id, chapter_hash,
-        json.dumps(layout_items, ensure_ascii=False),
+        fast_json.dumps(layout_items),
         layout_mode,
     )
 
 
-async def _load_user_overrides(novel_id: str) -> dict[str, tuple[float, float]]:
-    """Load user-adjusted coordinates for a novel."""
-    conn = await get_connection()
+async def _save_cached_layer_layouts(
+    novel_id: str, chapter_hash: str,
+    layer_layouts: dict[str, list[dict]], layout_mode: str,
+) -> None:
+    """Cache several layer layouts with a single connection and commit."""
+    await world_structure_store.save_layer_layouts(
+        novel_id, chapter_hash,
+        [(lid, fast_json.dumps(items)) for lid, items in layer_layouts.items()],
+        layout_mode,
+    )
+
+
+async def _load_all_overrides(
+    novel_id: str,
+) -> tuple[dict[str, tuple[float, float]], dict[str, str], dict[str, tuple[float, float]]]:
+    """Load every user override for a novel in a single query.
+
+    Returns (positions, locked_parents, geo_overrides) partitioned from the
+    same ``map_user_overrides`` rows, so a map request costs one index seek
+    and one connection instead of three.
+    """
+    conn = await acquire_connection()
     try:
         cursor = await conn.execute(
-            "SELECT location_name, x, y FROM map_user_overrides WHERE novel_id = ?",
+            "SELECT location_name, x, y, lat, lng, constraint_type, locked_parent "
+            "FROM map_user_overrides WHERE novel_id = ?",
             (novel_id,),
         )
         rows = await cursor.fetchall()
-        return {row["location_name"]: (row["x"], row["y"]) for row in rows}
     finally:
-        await conn.close()
+        await release_connection(conn)
+
+    positions: dict[str, tuple[float, float]] = {}
+    locked: dict[str, str] = {}
+    geo: dict[str, tuple[float, float]] = {}
+    for row in rows:
+        name = row["location_name"]
+        positions[name] = (row["x"], row["y"])
+        if row["constraint_type"] == "locked" and row["locked_parent"] is not None:
+            locked[name] = row["locked_parent"]
+        if row["lat"] is not None and row["lng"] is not None:
+            geo[name] = (row["lat"], row["lng"])
+    return positions, locked, geo
+
+
+async def _load_user_overrides(novel_id: str) -> dict[str, tuple[float, float]]:
+    """Load user-adjusted coordinates for a novel."""
+    return (await _load_all_overrides(novel_id))[0]
 
 
 async def _load_locked_parents(novel_id: str) -> dict[str, str]:
     """Load locked parent assignments from user overrides."""
-    conn = await get_connection()
-    try:
-        cursor = await conn.execute(
-            "SELECT location_name, locked_parent FROM map_user_overrides "
-            "WHERE novel_id = ? AND constraint_type = 'locked' AND locked_parent IS NOT NULL",
-            (novel_id,),
-        )
-        rows = await cursor.fetchall()
-        return {row["location_name"]: row["locked_parent"] for row in rows}
-    finally:
-        await conn.close()
+    return (await _load_all_overrides(novel_id))[1]
 
 
 async def save_user_override(
@@ -1675,10 +2040,36 @@ async def save_user_override(
     *, lat: float | None = None, lng: float | None = None,
     constraint_type: str = "position", locked_parent: str | None = None,
 ) -> None:
-    """Save or update a user coordinate override and invalidate layout cache."""
-    conn = await get_connection()
+    """Save or update a user coordinate override and invalidate layout cache.
+
+    The database runs in WAL mode with ``synchronous=NORMAL``, so a save
+    that returned just before a power loss may be lost (the file stays
+    consistent); the user would only need to drag the pin again.
+    """
+    await save_user_overrides_bulk(novel_id, [{
+        "location_name": location_name,
+        "x": x,
+        "y": y,
+        "lat": lat,
+        "lng": lng,
+        "constraint_type": constraint_type,
+        "locked_parent": locked_parent,
+    }])
+
+
+async def save_user_overrides_bulk(novel_id: str, items: list[dict]) -> None:
+    """Save or update many user overrides in one transaction.
+
+    Each item carries ``location_name``, ``x``, ``y`` and optionally ``lat``,
+    ``lng``, ``constraint_type`` (default ``"position"``) and
+    ``locked_parent``. The layout cache is invalidated once for the batch.
+    """
+    if not items:
+        return
+    conn = await acquire_connection()
     try:
-        await conn.execute(
+        await conn.execute("BEGIN IMMEDIATE")
+        await conn.executemany(
             """INSERT INTO map_user_overrides
                (novel_id, location_name, x, y, lat, lng, constraint_type, locked_parent, updated_at)
                VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
@@ -1688,30 +2079,37 @@ async def save_user_override(
                              constraint_type=excluded.constraint_type,
                              locked_parent=excluded.locked_parent,
                              updated_at=datetime('now')""",
-            (novel_id, location_name, x, y, lat, lng, constraint_type, locked_parent),
+            (
+                (
+                    novel_id, item["location_name"], item["x"], item["y"],
+                    item.get("lat"), item.get("lng"),
+                    item.get("constraint_type") or "position",
+                    item.get("locked_parent"),
+                )
+                for item in items
+            ),
         )
-        # Invalidate all cached layouts for this novel
+        # Invalidate all cached layouts for this novel, including per-layer
+        # ones (compute_layered_layout honours user overrides too)
         await conn.execute(
             "DELETE FROM map_layouts WHERE novel_id = ?", (novel_id,),
         )
+        await conn.execute(
+            "DELETE FROM layer_layouts WHERE novel_id = ?", (novel_id,),
+        )
         await conn.commit()
+    except Exception:
+        await conn.rollback()
+        raise
     finally:
-        await conn.close()
+        await release_connection(conn)
+    _invalidate_layout_rt_cache(novel_id)
+    invalidate_map_cache(novel_id)
 
 
 async def _load_geo_overrides(novel_id: str) -> dict[str, tuple[float, float]]:
     """Load user-adjusted geographic (lat/lng) overrides for a novel."""
-    conn = await get_connection()
-    try:
-        cursor = await conn.execute(
-            "SELECT location_name, lat, lng FROM map_user_overrides "
-            "WHERE novel_id = ? AND lat IS NOT NULL AND lng IS NOT NULL",
-            (novel_id,),
-        )
-        rows = await cursor.fetchall()
-        return {row["location_name"]: (row["lat"], row["lng"]) for row in rows}
-    finally:
-        await conn.close()
+    return (await _load_all_overrides(novel_id))[2]
 
 
 async def invalidate_layout_cache(novel_id: str) -> None:
@@ -1719,7 +2117,7 @@ async def invalidate_layout_cache(novel_id: str) -> None:
 
     Preserves the satisfaction baseline for quality regression comparison.
     """
-    conn = await get_connection()
+    conn = await acquire_connection()
     try:
         # Save the old satisfaction as baseline before deleting the cache
         cursor = await conn.execute(
@@ -1743,9 +2141,13 @@ async def invalidate_layout_cache(novel_id: str) -> None:
 
         await conn.commit()
     finally:
-        await conn.close()
-    # Also invalidate layer-level layout cache
+        await release_connection(conn)
+    # Also invalidate layer-level layout cache and cached map responses.
+    # The alias map is not dropped here: this runs after every analysed
+    # chapter, and aliases are invalidated when the run stops instead.
     await world_structure_store.delete_layer_layouts(novel_id)
+    _invalidate_layout_rt_cache(novel_id)
+    invalidate_map_cache(novel_id)
 
 
 async def _compute_or_load_layout(
@@ -1755,13 +2157,24 @@ async def _compute_or_load_layout(
     spatial_constraints: list[dict],
     first_chapter: dict[str, int] | None = None,
     location_region_bounds: dict[str, tuple[float, float, float, float]] | None = None,
+    user_overrides: dict[str, tuple[float, float]] | None = None,
 ) -> tuple[list[dict], str, str | None, dict | None]:
     """Load cached layout or compute a new one.
 
+    ``user_overrides`` may be passed in when the caller has already loaded
+    them; otherwise they are fetched on a cache miss.
+
     Returns (layout_list, layout_mode, terrain_url, satisfaction_or_None).
     """
+    # In-process read-through cache (skips the SQLite round-trip + JSON parse)
+    rt_key = (novel_id, chapter_hash)
+    hit = _layout_rt_cache.get(rt_key)
+    if hit is not None:
+        _layout_rt_cache.move_to_end(rt_key)
+        return _copy_layout_entry(hit)
+
     # Try loading from cache
-    conn = await get_connection()
+    conn = await acquire_connection()
     try:
         cursor = await conn.execute(
             "SELECT layout_json, layout_mode, terrain_path, satisfaction_json FROM map_layouts WHERE novel_id = ? AND chapter_hash = ?",
@@ -1769,7 +2182,7 @@ async def _compute_or_load_layout(
         )
         row = await cursor.fetchone()
         if row:
-            layout_data = json.loads(row["layout_json"])
+            layout_data = fast_json.loads(row["layout_json"])
             terrain_path = row["terrain_path"]
             terrain_url = f"/api/novels/{novel_id}/map/terrain" if terrain_path else None
             cached_satisfaction = None
@@ -1778,15 +2191,18 @@ async def _compute_or_load_layout(
                     cached_satisfaction = json.loads(row["satisfaction_json"])
                 except (json.JSONDecodeError, TypeError):
                     pass
-            return layout_data, row["layout_mode"], terrain_url, cached_satisfaction
+            entry = (layout_data, row["layout_mode"], terrain_url, cached_satisfaction)
+            _layout_rt_put(rt_key, entry)
+            return _copy_layout_entry(entry)
     finally:
-        await conn.close()
+        await release_connection(conn)
 
     if not locations:
         return [], "hierarchy", None, None
 
     # Load user overrides
-    user_overrides = await _load_user_overrides(novel_id)
+    if user_overrides is None:
+        user_overrides = await _load_user_overrides(novel_id)
 
     # Compute layout in thread pool to avoid blocking the event loop
     solver = ConstraintSolver(
@@ -1808,7 +2224,7 @@ async def _compute_or_load_layout(
 
     # Load quality baseline (from previous analysis) and compute diff
     satisfaction_json = json.dumps(satisfaction, ensure_ascii=False) if satisfaction else None
-    conn = await get_connection()
+    conn = await acquire_connection()
     try:
         # Check for baseline row saved during invalidation
         cursor = await conn.execute(
@@ -1848,13 +2264,45 @@ async def _compute_or_load_layout(
                DO UPDATE SET layout_json=excluded.layout_json, layout_mode=excluded.layout_mode,
                             terrain_path=excluded.terrain_path, satisfaction_json=excluded.satisfaction_json,
                             created_at=datetime('now')""",
-            (novel_id, chapter_hash, json.dumps(layout_data, ensure_ascii=False), layout_mode, terrain_path, satisfaction_json),
+            (novel_id, chapter_hash, fast_json.dumps(layout_data), layout_mode, terrain_path, satisfaction_json),
         )
         await conn.commit()
     finally:
-        await conn.close()
+        await release_connection(conn)
+
+    entry = (layout_data, layout_mode, terrain_url, satisfaction)
+    _layout_rt_put(rt_key, entry)
+    return _copy_layout_entry(entry)
 
-    return layout_data, layout_mode, terrain_url, satisfaction
+
+# (novel_id, chapter_hash) → (layout, layout_mode, terrain_url, satisfaction)
+_layout_rt_cache: OrderedDict[
+    tuple[str, str], tuple[list[dict], str, str | None, dict | None]
+] = OrderedDict()
+_LAYOUT_RT_CACHE_MAX = 128
+
+
+def _layout_rt_put(
+    key: tuple[str, str],
+    entry: tuple[list[dict], str, str | None, dict | None],
+) -> None:
+    _layout_rt_cache[key] = entry
+    _layout_rt_cache.move_to_end(key)
+    while len(_layout_rt_cache) > _LAYOUT_RT_CACHE_MAX:
+        _layout_rt_cache.popitem(last=False)
+
+
+def _copy_layout_entry(
+    entry: tuple[list[dict], str, str | None, dict | None],
+) -> tuple[list[dict], str, str | None, dict | None]:
+    """Copy layout items so callers may extend/snap them without touching the cache."""
+    layout_data, layout_mode, terrain_url, satisfaction = entry
+    return [dict(item) for item in layout_data], layout_mode, terrain_url, satisfaction
+
+
+def _invalidate_layout_rt_cache(novel_id: str) -> None:
+    for k in [k for k in _layout_rt_cache if k[0] == novel_id]:
+        del _layout_rt_cache[k]
 
 
 # ── Timeline (Events) ────────────────────────────
@@ -1865,40 +2313,70 @@ _MIN_APPEARANCE_CHAPTERS = 3  # characters must appear in ≥ N chapters to get
 _MAJOR_PARTICIPANT_THRESHOLD = 5  # ≥ N participants → is_major
 
 
+@dataclass(slots=True)
+class _TimelineEvent:
+    """One timeline event; converted to the response dict at the end."""
+
+    id: int
+    chapter: int
+    summary: str
+    type: str
+    importance: str
+    participants: list[str]
+    location: str | None
+    is_major: bool
+    extra: dict | None = None
+
+    def to_dict(self) -> dict:
+        entry: dict = {
+            "id": self.id,
+            "chapter": self.chapter,
+            "summary": self.summary,
+            "type": self.type,
+            "importance": self.importance,
+            "participants": self.participants,
+            "location": self.location,
+            "is_major": self.is_major,
+        }
+        if self.extra:
+            entry.update(self.extra)
+        return entry
+
+
 async def get_timeline_data(
     novel_id: str, chapter_start: int, chapter_end: int
+) -> dict:
+    return await _cached_view("timeline", _build_timeline_data, novel_id, chapter_start, chapter_end)
+
+
+async def _build_timeline_data(
+    novel_id: str, chapter_start: int, chapter_end: int
 ) -> dict:
     facts = await _load_facts_in_range(novel_id, chapter_start, chapter_end)
 
-    events: list[dict] = []
-    swimlanes: dict[str, list[int]] = defaultdict(list)
     seen_characters: set[str] = set()
 
-    event_id = 0
+    # Slotted records (event id = list index); the response dicts are only
+    # materialised once, after all facts are processed.
+    records: list[_TimelineEvent] = []
+    # Flat (participant, event_id) columns, grouped into swimlanes at the end
+    lane_people: list[str] = []
+    lane_ids: list[int] = []
 
     def _add(summary: str, etype: str, importance: str,
              participants: list[str], location: str | None, ch: int,
              extra: dict | None = None) -> None:
-        nonlocal event_id
-        is_major = len(participants) >= _MAJOR_PARTICIPANT_THRESHOLD
+        event_id = len(records)
+        n_participants = len(participants)
+        is_major = n_participants >= _MAJOR_PARTICIPANT_THRESHOLD
         if is_major and importance == "medium":
             importance = "high"
-        entry: dict = {
-            "id": event_id,
-            "chapter": ch,
-            "summary": summary,
-            "type": etype,
-            "importance": importance,
-            "participants": participants,
-            "location": location,
-            "is_major": is_major,
-        }
-        if extra:
-            entry.update(extra)
-        events.append(entry)
-        for p in participants:
-            swimlanes[p].append(event_id)
-        event_id += 1
+        records.append(_TimelineEvent(
+            event_id, ch, summary, etype, importance,
+            participants, location, is_major, extra,
+        ))
+        lane_people.extend(participants)
+        lane_ids.extend([event_id] * n_participants)
 
     # ── Pre-compute character chapter counts (for 登场 filtering) ──
     char_chapters: dict[str, set[int]] = defaultdict(set)
@@ -2001,14 +2479,21 @@ async def get_timeline_data(
                 _add(summary, "关系变化", "high",
                      [rel.person_a, rel.person_b], None, ch)
 
+    # ── Materialise events and swimlanes ──
+    events = [r.to_dict() for r in records]
+
+    # Lanes keyed in first-appearance order; ids arrive already sorted
+    swimlanes: dict[str, list[int]] = {p: [] for p in dict.fromkeys(lane_people)}
+    for p, event_id in zip(lane_people, lane_ids):
+        swimlanes[p].append(event_id)
+
     # ── Compute suggested defaults ──
-    total = len(events)
     suggested_hidden_types = ["角色登场", "物品交接"]
     suggested_min_swimlane = 5 if len(swimlanes) > 100 else 3 if len(swimlanes) > 30 else 1
 
     return {
         "events": events,
-        "swimlanes": dict(swimlanes),
+        "swimlanes": swimlanes,
         "suggested_hidden_types": suggested_hidden_types,
         "suggested_min_swimlane": suggested_min_swimlane,
         "total_swimlanes": len(swimlanes),
@@ -2020,108 +2505,170 @@ async def get_timeline_data(
 # Location types that indicate an organization
 _ORG_TYPE_KEYWORDS = ("门", "派", "宗", "帮", "教", "盟", "会", "阁", "堂",
                        "军", "朝", "国", "族", "殿", "府", "院")
+# All keywords are single characters, so one character class does the whole
+# membership test in a single C-level scan.
+_ORG_TYPE_RE = re.compile("[" + "".join(_ORG_TYPE_KEYWORDS) + "]")
 
 
+# Distinct location types / concept categories per novel are few, while
+# the check runs for every location and concept of every chapter.
+@lru_cache(maxsize=1024)
 def _is_org_type(loc_type: str) -> bool:
     """Check whether a location type represents an organization."""
-    return any(kw in loc_type for kw in _ORG_TYPE_KEYWORDS)
+    return _ORG_TYPE_RE.search(loc_type) is not None
+
+
+@dataclass(slots=True)
+class _OrgMember:
+    """One person's membership record in an organization."""
+
+    person: str
+    role: str
+    status: str
 
 
 async def get_factions_data(
     novel_id: str, chapter_start: int, chapter_end: int
+) -> dict:
+    return await _cached_view("factions", _build_factions_data, novel_id, chapter_start, chapter_end)
+
+
+async def _build_factions_data(
+    novel_id: str, chapter_start: int, chapter_end: int
 ) -> dict:
     facts = await _load_facts_in_range(novel_id, chapter_start, chapter_end)
     alias_map = await build_alias_map(novel_id)
+    # Bound once: every name below goes through alias resolution
+    resolve = alias_map.get
+    is_org = _is_org_type
 
-    # org_name -> {name, type}
+    # org_name -> {name, type}. Inserts are guarded with `not in` rather than
+    # setdefault(name, {...}): names repeat across chapters, and setdefault
+    # would build a throwaway dict on every hit.
     org_info: dict[str, dict] = {}
-    # org_name -> {person_name -> {person, role, status}}
-    org_members: dict[str, dict[str, dict]] = defaultdict(dict)
+    # (org_name, person_name) -> member record; nested per-org output is
+    # only materialised at the end
+    org_members: dict[tuple[str, str], _OrgMember] = {}
     org_relations: list[dict] = []
-
-    # ── Source 1: org_events (explicit membership changes) ──
+    # Sources 2 and 4 collect into their own maps (first type wins) and are
+    # merged after the walk, so org_info keeps the source-ordered precedence
+    # and insertion order of separate passes.
+    # Many sects/factions appear as locations (type="门派"/"帮派" etc.);
+    # characters visiting these locations are associated as members.
+    org_locations: dict[str, str] = {}  # canonical org location -> type
+    concept_orgs: dict[str, str] = {}  # org-system concept -> category
+
+    # ── Sources 1, 2, 4: org_events, org-typed locations, org concepts ──
     for fact in facts:
         ch = fact.chapter_id
 
         for oe in fact.org_events:
-            org_name = alias_map.get(oe.org_name, oe.org_name)
+            org_name = oe.org_name
+            org_name = resolve(org_name, org_name)
             if org_name not in org_info:
                 org_info[org_name] = {"name": org_name, "type": oe.org_type}
 
-            if oe.member:
-                member = alias_map.get(oe.member, oe.member)
-                existing = org_members[org_name].get(member)
+            member = oe.member
+            if member:
+                member = resolve(member, member)
+                key = (org_name, member)
+                existing = org_members.get(key)
+                role = oe.role
                 # Keep the latest action; prefer explicit role over None
-                if existing is None or oe.role:
-                    org_members[org_name][member] = {
-                        "person": member,
-                        "role": oe.role or (existing["role"] if existing else ""),
-                        "status": oe.action,
-                    }
-
-            if oe.org_relation:
-                other = alias_map.get(oe.org_relation.other_org, oe.org_relation.other_org)
+                if existing is None:
+                    org_members[key] = _OrgMember(member, role or "", oe.action)
+                elif role:
+                    existing.role = role
+                    existing.status = oe.action
+
+            rel = oe.org_relation
+            if rel:
+                other = resolve(rel.other_org, rel.other_org)
                 org_relations.append({
                     "source": org_name,
                     "target": other,
-                    "type": oe.org_relation.type,
+                    "type": rel.type,
                     "chapter": ch,
                 })
                 # Ensure the related org is also tracked
                 if other not in org_info:
-                    org_info[other] = {
-                        "name": other,
-                        "type": "组织",
-                    }
+                    org_info[other] = {"name": other, "type": "组织"}
 
-    # ── Source 2: locations with org-like types ──
-    # Many sects/factions appear as locations (type="门派"/"帮派" etc.)
-    # Characters visiting these locations are associated as members.
-    org_locations: set[str] = set()  # canonical location names that are orgs
-    for fact in facts:
         for loc in fact.locations:
-            loc_canonical = alias_map.get(loc.name, loc.name)
-            if _is_org_type(loc.type) and loc_canonical not in org_info:
-                org_info[loc_canonical] = {"name": loc_canonical, "type": loc.type}
-            if _is_org_type(loc.type):
-                org_locations.add(loc_canonical)
+            loc_type = loc.type
+            if not is_org(loc_type):
+                continue
+            loc_name = loc.name
+            org_locations.setdefault(resolve(loc_name, loc_name), loc_type)
+
+        for concept in fact.new_concepts:
+            cat = concept.category
+            if is_org(cat):
+                concept_orgs.setdefault(concept.name, cat)
+
+    for name, org_type in org_locations.items():
+        if name not in org_info:
+            org_info[name] = {"name": name, "type": org_type}
 
     # ── Source 3: characters at org-locations ──
-    for fact in facts:
+    # Each character's visits are canonicalised and de-duplicated once
+    # (ordered, so output stays deterministic) and only org hits are walked.
+    for fact in facts if org_locations else ():
         for char in fact.characters:
-            char_canonical = alias_map.get(char.name, char.name)
-            for loc_name in char.locations_in_chapter:
-                loc_canonical = alias_map.get(loc_name, loc_name)
-                if loc_canonical in org_locations:
-                    if char_canonical not in org_members[loc_canonical]:
-                        org_members[loc_canonical][char_canonical] = {
-                            "person": char_canonical,
-                            "role": "",
-                            "status": "出现",
-                        }
+            visits = char.locations_in_chapter
+            if not visits:
+                continue
+            # Without aliases, names are already canonical: skip the generator
+            canon_visits = (
+                dict.fromkeys(resolve(n, n) for n in visits) if alias_map
+                else dict.fromkeys(visits)
+            )
+            org_hits = [loc for loc in canon_visits if loc in org_locations]
+            if not org_hits:
+                continue
+            char_canonical = resolve(char.name, char.name)
+            for loc_canonical in org_hits:
+                key = (loc_canonical, char_canonical)
+                if key not in org_members:
+                    org_members[key] = _OrgMember(char_canonical, "", "出现")
 
-    # ── Source 4: new_concepts about org systems ──
-    for fact in facts:
-        for concept in fact.new_concepts:
-            cat = concept.category
-            if _is_org_type(cat) and concept.name not in org_info:
-                org_info[concept.name] = {"name": concept.name, "type": cat}
+    for name, cat in concept_orgs.items():
+        if name not in org_info:
+            org_info[name] = {"name": name, "type": cat}
 
     # Build output
+    members: dict[str, list[dict]] = {}
+    for (org, _person), m in org_members.items():
+        members.setdefault(org, []).append(
+            {"person": m.person, "role": m.role, "status": m.status}
+        )
+
+    member_counts = {org: len(lst) for org, lst in members.items()}
     orgs = [
         {
             "id": name,
             "name": name,
             "type": info["type"],
-            "member_count": len(org_members.get(name, {})),
+            "member_count": member_counts.get(name, 0),
         }
         for name, info in org_info.items()
     ]
-    orgs.sort(key=lambda o: -o["member_count"])
-
-    members = {
-        org: list(members_map.values())
-        for org, members_map in org_members.items()
-    }
+    orgs.sort(key=itemgetter("member_count"), reverse=True)
 
     return {"orgs": orgs, "relations": org_relations, "members": members}
+
+
+# ── All views ──────────
+
+
+async def get_all_visualizations(
+    novel_id: str, chapter_start: int, chapter_end: int
+) -> dict:
+    """Build graph, map, timeline and factions data from one fact load."""
+    with shared_fact_scope():
+        return {
+            "graph": await get_graph_data(novel_id, chapter_start, chapter_end),
+            "map": await get_map_data(novel_id, chapter_start, chapter_end),
+            "timeline": await get_timeline_data(novel_id, chapter_start, chapter_end),
+            "factions": await get_factions_data(novel_id, chapter_start, chapter_end),
+        }
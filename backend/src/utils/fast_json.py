@@ -0,0 +1,60 @@
+"""JSON encode/decode with an optional orjson fast path.
+
+When ``orjson`` is installed, ``dumps``/``loads`` use it; otherwise they fall
+back to the stdlib ``json`` module. Both paths produce UTF-8 text without
+ASCII escaping (the ``ensure_ascii=False`` convention used across the
+backend), and decode errors are ``json.JSONDecodeError`` in either case.
+NumPy scalars and arrays serialize on both paths, as Python numbers/lists.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder: turn NumPy scalars and arrays into Python values.
+
+    Covers what stdlib json and orjson's OPT_SERIALIZE_NUMPY leave out
+    (e.g. int64 for json, non-contiguous or object arrays for orjson).
+    """
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    return orjson.dumps(
+        obj,
+        default=_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+def dumps(obj: Any) -> str:
+    """Serialize ``obj`` to a JSON string."""
+    if orjson is not None:
+        return _orjson_dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False, default=_default)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes (no str round-trip with orjson)."""
+    if orjson is not None:
+        return _orjson_dumps(obj)
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=_default,
+    ).encode()
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON string or UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
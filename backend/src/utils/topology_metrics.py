@@ -161,6 +161,48 @@ def _compute_chain_accuracy(
     return total_ratio / chain_count if chain_count > 0 else 1.0
 
 
+def parent_chain_depths(parents: dict[str, str | None]) -> dict[str, int]:
+    """Depth of every key of ``parents`` in the parent chain, each computed once.
+
+    A location's depth is the number of parent hops until a root (falsy
+    parent), a parent missing from ``parents``, or an already-walked name
+    (cycle). Cycle members therefore all get the cycle length, and names
+    leading into a cycle add their distance to it — the same result as a
+    recursive walk with a visited set, without re-walking shared ancestors.
+    """
+    depths: dict[str, int] = {}
+    for start in parents:
+        if start in depths:
+            continue
+        stack: list[str] = []
+        on_stack: dict[str, int] = {}
+        node = start
+        while True:
+            if node in depths:
+                base = depths[node]
+                break
+            idx = on_stack.get(node)
+            if idx is not None:
+                base = len(stack) - idx
+                for member in stack[idx:]:
+                    depths[member] = base
+                del stack[idx:]
+                break
+            parent = parents.get(node)
+            if not parent:
+                base = 0
+                if node in parents:
+                    depths[node] = 0
+                break
+            on_stack[node] = len(stack)
+            stack.append(node)
+            node = parent
+        for member in reversed(stack):
+            base += 1
+            depths[member] = base
+    return depths
+
+
 def compute_hierarchy_health(
     location_parents: dict[str, str],
     location_tiers: dict[str, str] | None = None,
@@ -1,5 +1,7 @@
 """Tests for alias_resolver — safety levels, char variant normalization, Union-Find merging."""
 
+import asyncio
+
 import pytest
 
 from src.services.alias_resolver import (
@@ -165,3 +167,80 @@ class TestHotfixXiyoujiShaBajie:
         patched = _apply_known_hotfix_patches(self._buggy_map())
         assert patched["沙悟净"] == "沙僧"
         assert patched["悟能"] == "八戒"
+
+
+# ── build_alias_map caching ─────────────────────────────────────
+
+
+class TestBuildAliasMapCache:
+    """Concurrent callers share one build; invalidation discards stale builds."""
+
+    NOVEL = "novel-alias-cache"
+
+    @pytest.fixture(autouse=True)
+    def _patch_build(self, monkeypatch):
+        from src.services import alias_resolver
+
+        self.calls = 0
+        self.gate = asyncio.Event()
+
+        async def _merged(_novel_id):
+            self.calls += 1
+            await self.gate.wait()
+            return {"悟空": "孙悟空"}
+
+        async def _overrides(_novel_id, alias_map):
+            return alias_map
+
+        monkeypatch.setattr(alias_resolver, "_build_merged", _merged)
+        monkeypatch.setattr(alias_resolver, "_apply_user_overrides", _overrides)
+        alias_resolver.invalidate_alias_cache(self.NOVEL)
+        yield
+        alias_resolver.invalidate_alias_cache(self.NOVEL)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_build(self):
+        from src.services.alias_resolver import _alias_cache, build_alias_map
+
+        pending = asyncio.gather(*(build_alias_map(self.NOVEL) for _ in range(3)))
+        await asyncio.sleep(0)
+        self.gate.set()
+        results = await pending
+
+        assert self.calls == 1
+        assert results[0] is results[1] is results[2]
+        assert _alias_cache[self.NOVEL] == {"悟空": "孙悟空"}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_build(self):
+        from src.services.alias_resolver import build_alias_map
+
+        first = asyncio.ensure_future(build_alias_map(self.NOVEL))
+        second = asyncio.ensure_future(build_alias_map(self.NOVEL))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        self.gate.set()
+
+        assert await second == {"悟空": "孙悟空"}
+        assert first.cancelled()
+        assert self.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_build_skips_caching(self):
+        from src.services.alias_resolver import (
+            _alias_cache,
+            build_alias_map,
+            invalidate_alias_cache,
+        )
+
+        pending = asyncio.ensure_future(build_alias_map(self.NOVEL))
+        await asyncio.sleep(0)
+        invalidate_alias_cache(self.NOVEL)
+        self.gate.set()
+
+        assert await pending == {"悟空": "孙悟空"}
+        assert self.NOVEL not in _alias_cache
+        await build_alias_map(self.NOVEL)
+        assert self.calls == 2
+        assert self.NOVEL in _alias_cache
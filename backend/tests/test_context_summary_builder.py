@@ -0,0 +1,47 @@
+"""Tests for preceding-fact loading in ContextSummaryBuilder."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.extraction import context_summary_builder as csb
+
+
+def _row(chapter_id, **fields):
+    return {"chapter_id": chapter_id, "fact": {"chapter_id": chapter_id, "novel_id": "n1", **fields}}
+
+
+async def _collect_facts(rows, chapter_num):
+    seen = []
+
+    def _capture(self, chapter_facts, recent_facts):
+        seen.extend(chapter_facts)
+        return {}
+
+    async def _rows(_novel_id):
+        return rows
+
+    async def _none(*_args):
+        return None
+
+    with patch.object(csb, "get_all_chapter_facts", _rows), \
+         patch.object(csb.world_structure_store, "load", _none), \
+         patch.object(csb.entity_dictionary_store, "get_all", _none), \
+         patch.object(csb.ContextSummaryBuilder, "_aggregate_characters", _capture):
+        await csb.ContextSummaryBuilder().build("n1", chapter_num)
+    return seen
+
+
+@pytest.mark.asyncio
+async def test_preceding_facts_validated_in_order():
+    rows = [_row(1, characters=[{"name": "悟空"}]), _row(2), _row(3)]
+    facts = await _collect_facts(rows, 3)
+    assert [f.chapter_id for f in facts] == [1, 2]
+    assert facts[0].characters[0].name == "悟空"
+
+
+@pytest.mark.asyncio
+async def test_malformed_preceding_fact_only_drops_itself():
+    rows = [_row(1), _row(2, characters=[{"aliases": []}]), _row(3)]
+    facts = await _collect_facts(rows, 4)
+    assert [f.chapter_id for f in facts] == [1, 3]
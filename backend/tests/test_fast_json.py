@@ -0,0 +1,69 @@
+"""Tests for the orjson-or-stdlib JSON helpers."""
+
+import json
+
+import pytest
+
+from src.utils import fast_json
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        if fast_json.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(fast_json, "orjson", None)
+    return request.param
+
+
+def test_roundtrip_keeps_cjk_unescaped(backend):
+    layout = [{"name": "花果山", "x": 12.5, "y": -3.0, "radius": 20, "is_portal": False}]
+    text = fast_json.dumps(layout)
+    assert isinstance(text, str)
+    assert "花果山" in text
+    assert fast_json.loads(text) == layout
+    assert fast_json.loads(text.encode()) == layout
+    assert json.loads(text) == layout
+
+
+def test_non_str_keys_match_stdlib(backend):
+    assert fast_json.loads(fast_json.dumps({1: "a"})) == {"1": "a"}
+
+
+def test_numpy_values_serialize(backend):
+    np = pytest.importorskip("numpy")
+    payload = {
+        "x": np.float64(1.5), "n": np.int64(3), "f": np.float32(2.5),
+        "ok": np.bool_(True), "xy": np.arange(3), "col": np.eye(2)[:, 0],
+    }
+    expected = {"x": 1.5, "n": 3, "f": 2.5, "ok": True, "xy": [0, 1, 2], "col": [1.0, 0.0]}
+    assert fast_json.loads(fast_json.dumps(payload)) == expected
+    assert fast_json.loads(fast_json.dumps_bytes(payload)) == expected
+    with pytest.raises(TypeError):
+        fast_json.dumps({"bad": object()})
+
+
+def test_decode_error_is_json_decode_error(backend):
+    with pytest.raises(json.JSONDecodeError):
+        fast_json.loads("{not json")
+
+
+def test_dumps_bytes_matches_json_response(backend):
+    from fastapi.responses import JSONResponse
+
+    from src.api.responses import FastJSONResponse
+
+    payload = {"nodes": [{"id": "孙悟空", "aliases": ["悟空"]}], "max_edge_weight": 3}
+    body = fast_json.dumps_bytes(payload)
+    assert isinstance(body, bytes)
+    assert body == JSONResponse(payload).body
+    assert FastJSONResponse(payload).body == body
+
+
+def test_visualization_routers_default_to_fast_json_response():
+    from src.api.responses import FastJSONResponse
+    from src.api.routes import factions, graph, map as map_routes, timeline
+
+    for module in (graph, map_routes, timeline, factions):
+        assert module.router.default_response_class is FastJSONResponse
@@ -205,3 +205,41 @@ def _normalize_location_aliases(names: set[str]) -> dict[str, str]:
                 merge_map[short] = long
                 break
     return merge_map
+
+
+# ── Name suffix trie ────────────────────────────────────────────
+
+
+class TestNameSuffixMatch:
+    """_match_name_suffix must agree with the ordered _NAME_SUFFIX_TIER scan."""
+
+    @staticmethod
+    def _linear(name: str):
+        from src.services.world_structure_agent import _NAME_SUFFIX_TIER
+
+        for suffix, tier in _NAME_SUFFIX_TIER:
+            if name.endswith(suffix):
+                return suffix, tier
+        return None
+
+    def test_no_entry_shadows_a_later_longer_one(self):
+        from src.services.world_structure_agent import _NAME_SUFFIX_TIER
+
+        for i, (short, _t) in enumerate(_NAME_SUFFIX_TIER):
+            for long, _t2 in _NAME_SUFFIX_TIER[i + 1:]:
+                assert not (long != short and long.endswith(short)), (short, long)
+
+    @pytest.mark.parametrize("name", [
+        "黑龙江", "黑龙江省", "浙江", "长江", "荣国府", "开封府", "南赡部洲",
+        "四大部洲", "东洋大海", "上海", "天竺国东界", "花果山", "ABC", "洲", "",
+    ])
+    def test_matches_linear_scan(self, name):
+        from src.services.world_structure_agent import _match_name_suffix
+
+        hit = _match_name_suffix(name)
+        assert (hit[:2] if hit else None) == self._linear(name)
+
+    def test_rank_uses_trie_tier(self):
+        assert _get_suffix_rank("南赡部洲") == 1
+        assert _get_suffix_rank("荣国府") == 5
+        assert _get_suffix_rank("ABC") is None
@@ -402,3 +402,34 @@ class TestLandmassGeneration:
             canvas_width=800, canvas_height=600,
         )
         assert "landmasses" in result
+
+
+class TestNonGeographicDetection:
+    """Celestial/underworld keyword matching used to keep realms off the map."""
+
+    @pytest.mark.parametrize("name,celestial,underworld", [
+        ("南天门", True, False),
+        ("灵霄宝殿外", True, False),
+        ("奈何桥", False, True),
+        ("阴曹地府", False, True),
+        ("花果山", False, False),
+        ("天竺国", False, False),
+    ])
+    def test_keyword_match(self, name, celestial, underworld):
+        from src.services.map_layout_service import (
+            _is_celestial,
+            _is_non_geographic,
+            _is_underworld,
+        )
+
+        assert _is_celestial(name) is celestial
+        assert _is_underworld(name) is underworld
+        assert _is_non_geographic(name) is (celestial or underworld)
+
+    @pytest.mark.parametrize("text", ["东胜神洲", "大陆", "东海", "天竺国", "魔界", "花果山", "大", ""])
+    def test_macro_type_regex_matches_keyword_scan(self, text):
+        from src.services.map_layout_service import _MACRO_TYPE_KW, _MACRO_TYPE_RE
+
+        assert (_MACRO_TYPE_RE.search(text) is not None) == any(
+            kw in text for kw in _MACRO_TYPE_KW
+        )
@@ -63,3 +63,42 @@ async def test_alter_table_migration_idempotent():
     row = await cursor.fetchone()
     assert row[0] == 1
     await conn.close()
+
+
+@pytest.mark.asyncio
+async def test_layout_cache_lookups_use_primary_key_index(memory_db):
+    """Layout cache reads are a single PK index seek, never a table scan."""
+    queries = [
+        (
+            "SELECT layout_json, layout_mode, terrain_path, satisfaction_json "
+            "FROM map_layouts WHERE novel_id = ? AND chapter_hash = ?",
+            ("n", "h"),
+        ),
+        (
+            "SELECT layout_json, layout_mode, terrain_path, created_at "
+            "FROM layer_layouts WHERE novel_id = ? AND layer_id = ? AND chapter_hash = ?",
+            ("n", "overworld", "h"),
+        ),
+    ]
+    for sql, params in queries:
+        cursor = await memory_db.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        plan = " ".join(row[3] for row in await cursor.fetchall())
+        assert "SEARCH" in plan and "INDEX" in plan, plan
+        assert "SCAN" not in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_fact_range_query_is_index_driven(memory_db):
+    """The chapter-range fact load walks idx_chapters_novel in chapter order
+    and probes chapter_facts by its unique key: no scan, no sort."""
+    sql = (
+        "SELECT cf.fact_json, c.chapter_num FROM chapter_facts cf "
+        "JOIN chapters c ON cf.chapter_id = c.id AND cf.novel_id = c.novel_id "
+        "WHERE cf.novel_id = ? AND c.chapter_num >= ? AND c.chapter_num <= ? "
+        "ORDER BY c.chapter_num"
+    )
+    cursor = await memory_db.execute(f"EXPLAIN QUERY PLAN {sql}", ("n", 1, 10))
+    plan = " ".join(row[3] for row in await cursor.fetchall())
+    assert "idx_chapters_novel" in plan, plan
+    assert "sqlite_autoindex_chapter_facts_1" in plan, plan
+    assert "SCAN" not in plan and "TEMP B-TREE" not in plan, plan
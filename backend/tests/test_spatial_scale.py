@@ -84,6 +84,25 @@ def _make_agent(
     return agent
 
 
+class TestDetectGenre:
+    """Keyword scoring in _detect_genre."""
+
+    def test_scores_each_present_keyword_once(self):
+        from src.models.chapter_fact import ChapterFact
+        from src.services.world_structure_agent import _GENRE_KEYWORDS
+
+        agent = _make_agent()
+        text = "江湖中人都说县令来了，江湖又起风波。知县升了官。"
+        agent._detect_genre(text, ChapterFact(chapter_id=1, novel_id="test"))
+        expected = {
+            genre: sum(kw in text for kw in keywords)
+            for genre, keywords in _GENRE_KEYWORDS.items()
+        }
+        assert agent._genre_scores == expected
+        assert agent._genre_scores["wuxia"] == 1
+        assert agent._genre_scores["realistic"] == 1  # 县 (inside 县令/知县)
+
+
 class TestDetectSpatialScale:
     """Enhanced _detect_spatial_scale with 9 levels."""
 
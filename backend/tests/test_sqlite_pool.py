@@ -0,0 +1,92 @@
+"""Tests for the sqlite_db connection pool."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.db import sqlite_db
+
+
+@pytest.mark.asyncio
+async def test_pool_disabled_closes_connections(tmp_path):
+    with patch.object(sqlite_db, "DB_PATH", tmp_path / "data.db"):
+        conn = await sqlite_db.acquire_connection()
+        await sqlite_db.release_connection(conn)
+    assert not sqlite_db._pool
+    with pytest.raises(ValueError):
+        await conn.execute("SELECT 1")
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_connections_fifo(tmp_path):
+    with patch.object(sqlite_db, "DB_PATH", tmp_path / "data.db"):
+        sqlite_db.open_pool()
+        try:
+            a = await sqlite_db.acquire_connection()
+            b = await sqlite_db.acquire_connection()
+            await sqlite_db.release_connection(a)
+            await sqlite_db.release_connection(b)
+            assert await sqlite_db.acquire_connection() is a
+            assert await sqlite_db.acquire_connection() is b
+            await sqlite_db.release_connection(a)
+            await sqlite_db.release_connection(b)
+        finally:
+            await sqlite_db.close_pool()
+    assert not sqlite_db._pool
+
+
+@pytest.mark.asyncio
+async def test_pool_rolls_back_open_transaction(tmp_path):
+    with patch.object(sqlite_db, "DB_PATH", tmp_path / "data.db"):
+        sqlite_db.open_pool()
+        try:
+            conn = await sqlite_db.acquire_connection()
+            await conn.execute("CREATE TABLE t (x INTEGER)")
+            await conn.commit()
+            await conn.execute("INSERT INTO t VALUES (1)")
+            conn.row_factory = None
+            await sqlite_db.release_connection(conn)
+
+            again = await sqlite_db.acquire_connection()
+            assert again is conn
+            assert not again.in_transaction
+            cursor = await again.execute("SELECT COUNT(*) AS n FROM t")
+            assert (await cursor.fetchone())["n"] == 0
+            await sqlite_db.release_connection(again)
+        finally:
+            await sqlite_db.close_pool()
+
+
+@pytest.mark.asyncio
+async def test_pool_drops_connections_for_other_db_path(tmp_path):
+    sqlite_db.open_pool()
+    try:
+        with patch.object(sqlite_db, "DB_PATH", tmp_path / "a.db"):
+            old = await sqlite_db.acquire_connection()
+            await sqlite_db.release_connection(old)
+        with patch.object(sqlite_db, "DB_PATH", tmp_path / "b.db"):
+            new = await sqlite_db.acquire_connection()
+            assert new is not old
+            await sqlite_db.release_connection(new)
+    finally:
+        await sqlite_db.close_pool()
+
+
+@pytest.mark.asyncio
+async def test_get_connection_applies_pragmas(tmp_path):
+    with patch.object(sqlite_db, "DB_PATH", tmp_path / "data.db"):
+        conn = await sqlite_db.get_connection()
+    try:
+        expected = {
+            "journal_mode": "wal",
+            "synchronous": 1,  # NORMAL
+            "cache_size": -65536,
+            "temp_store": 2,  # MEMORY
+            "foreign_keys": 1,
+        }
+        for pragma, value in expected.items():
+            cursor = await conn.execute(f"PRAGMA {pragma}")
+            assert (await cursor.fetchone())[0] == value, pragma
+        assert not conn.in_transaction
+    finally:
+        await conn.close()
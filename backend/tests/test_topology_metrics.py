@@ -5,7 +5,7 @@ from pathlib import Path
 
 import pytest
 
-from src.utils.topology_metrics import compute_topology_metrics
+from src.utils.topology_metrics import compute_topology_metrics, parent_chain_depths
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
@@ -207,6 +207,38 @@ class TestComputeTopologyMetrics:
         assert result["parent_recall"] == 1.0
 
 
+# ── Parent chain depths ──────────────────────────────────────────
+
+
+class TestParentChainDepths:
+    def test_chains_cycles_and_missing_parents(self):
+        depths = parent_chain_depths({
+            "天下": None, "东胜神洲": "天下", "傲来国": "东胜神洲",
+            "花果山": "傲来国", "龙宫": "东海",  # parent not a key
+            "甲": "乙", "乙": "丙", "丙": "甲", "丁": "甲",  # cycle with a tail
+            "空": "",
+        })
+        assert depths == {
+            "天下": 0, "东胜神洲": 1, "傲来国": 2, "花果山": 3, "龙宫": 1,
+            "甲": 3, "乙": 3, "丙": 3, "丁": 4, "空": 0,
+        }
+
+    def test_hierarchy_metrics_depths(self):
+        from src.services.geo_skills.snapshot import HierarchyMetrics, HierarchySnapshot
+
+        snapshot = HierarchySnapshot(
+            location_parents={"花果山": "傲来国", "傲来国": "东胜神洲"},
+            location_tiers={"花果山": "site", "傲来国": "kingdom", "东胜神洲": "continent"},
+            parent_votes={},
+            location_frequencies={},
+            chapter_settings={},
+            location_chapters={},
+        )
+        metrics = HierarchyMetrics.compute(snapshot)
+        assert metrics.max_depth == 2
+        assert metrics.depth_distribution == {2: 1, 1: 1, 0: 1}
+
+
 # ── Integration with real golden standard files ──────────────────
 
 
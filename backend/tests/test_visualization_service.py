@@ -0,0 +1,1077 @@
+"""Tests for visualization_service data-access helpers and aggregation."""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from src.services import visualization_service as vs
+
+NOVEL = "novel-vis"
+
+
+class _NonClosing:
+    """Proxy that keeps the shared in-memory connection open across calls."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def vis_db(memory_db):
+    async def _factory():
+        return _NonClosing(memory_db)
+
+    async def _release(conn):
+        await conn.close()
+
+    with patch("src.services.visualization_service.acquire_connection", _factory), \
+         patch("src.services.visualization_service.release_connection", _release):
+        yield memory_db
+
+
+async def _insert_novel(conn):
+    await conn.execute(
+        "INSERT INTO novels (id, title) VALUES (?, ?)", (NOVEL, "西游记"),
+    )
+    await conn.commit()
+
+
+# ── User overrides ──────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_load_all_overrides_partitions_rows(vis_db):
+    await _insert_novel(vis_db)
+    await vs.save_user_override(NOVEL, "花果山", 10.0, 20.0)
+    await vs.save_user_override(
+        NOVEL, "水帘洞", 1.0, 2.0,
+        constraint_type="locked", locked_parent="花果山",
+    )
+    await vs.save_user_override(NOVEL, "长安", 3.0, 4.0, lat=34.3, lng=108.9)
+
+    positions, locked, geo = await vs._load_all_overrides(NOVEL)
+
+    assert positions == {
+        "花果山": (10.0, 20.0),
+        "水帘洞": (1.0, 2.0),
+        "长安": (3.0, 4.0),
+    }
+    assert locked == {"水帘洞": "花果山"}
+    assert geo == {"长安": (34.3, 108.9)}
+
+    # Thin wrappers return the matching slice
+    assert await vs._load_user_overrides(NOVEL) == positions
+    assert await vs._load_locked_parents(NOVEL) == locked
+    assert await vs._load_geo_overrides(NOVEL) == geo
+
+
+@pytest.mark.asyncio
+async def test_load_all_overrides_empty(vis_db):
+    await _insert_novel(vis_db)
+    assert await vs._load_all_overrides(NOVEL) == ({}, {}, {})
+
+
+# ── Map response cache ──────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_map_cache_hit_and_invalidate():
+    calls = []
+
+    async def _fake_build(novel_id, start, end, layer_id=None):
+        calls.append((novel_id, start, end, layer_id))
+        return {"locations": [], "n": len(calls)}
+
+    vs._map_cache.clear()
+    with patch.object(vs, "_build_map_data", _fake_build):
+        first = await vs.get_map_data(NOVEL, 1, 10)
+        first["analyzed_range"] = [1, 10]  # caller mutation must not leak
+        second = await vs.get_map_data(NOVEL, 1, 10)
+        assert len(calls) == 1
+        assert "analyzed_range" not in second
+
+        await vs.get_map_data(NOVEL, 1, 10, layer_id="sky")
+        assert len(calls) == 2
+
+        vs.invalidate_map_cache(NOVEL)
+        await vs.get_map_data(NOVEL, 1, 10)
+        assert len(calls) == 3
+    vs._map_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_map_cache_lock_shared_by_waiters_and_released_on_error():
+    calls = []
+    release = asyncio.Event()
+
+    async def _slow_build(novel_id, start, end, layer_id=None):
+        calls.append(start)
+        await release.wait()
+        return {"n": len(calls)}
+
+    vs._map_cache.clear()
+    with patch.object(vs, "_build_map_data", _slow_build):
+        first = asyncio.create_task(vs.get_map_data(NOVEL, 1, 10))
+        waiter = asyncio.create_task(vs.get_map_data(NOVEL, 1, 10))
+        await asyncio.sleep(0)
+        release.set()
+        await first
+        # a caller arriving while the waiter is still queued shares its lock
+        late = asyncio.create_task(vs.get_map_data(NOVEL, 1, 10))
+        results = await asyncio.gather(waiter, late)
+    assert calls == [1]
+    assert results == [{"n": 1}, {"n": 1}]
+    assert vs._map_cache_locks == {}
+
+    async def _failing_build(novel_id, start, end, layer_id=None):
+        raise RuntimeError("boom")
+
+    with patch.object(vs, "_build_map_data", _failing_build):
+        with pytest.raises(RuntimeError):
+            await vs.get_map_data(NOVEL, 2, 10)
+    assert vs._map_cache_locks == {}
+    vs._map_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_view_cache_tracks_fact_writes_and_aliases(vis_db):
+    from src.services.alias_resolver import invalidate_alias_cache
+
+    await _insert_novel(vis_db)
+    calls = []
+
+    async def _fake_build(novel_id, start, end):
+        calls.append((novel_id, start, end))
+        return {"nodes": [], "n": len(calls)}
+
+    async def _add_fact(num):
+        cursor = await vis_db.execute(
+            "INSERT INTO chapters (novel_id, chapter_num, title, content) "
+            "VALUES (?, ?, ?, '')",
+            (NOVEL, num, f"第{num}回"),
+        )
+        await vis_db.execute(
+            "INSERT INTO chapter_facts (novel_id, chapter_id, fact_json) VALUES (?, ?, ?)",
+            (NOVEL, cursor.lastrowid, '{"chapter_id": 0, "novel_id": "x"}'),
+        )
+        await vis_db.commit()
+
+    vs._view_cache.clear()
+    await _add_fact(1)
+    with patch.object(vs, "_build_graph_data", _fake_build):
+        first = await vs.get_graph_data(NOVEL, 1, 5)
+        first["extra"] = True  # caller mutation must not leak
+        second = await vs.get_graph_data(NOVEL, 1, 5)
+        assert len(calls) == 1
+        assert "extra" not in second
+
+        await _add_fact(2)
+        assert (await vs.get_graph_data(NOVEL, 1, 5))["n"] == 2
+
+        # scenes land in a separate UPDATE after the fact row is inserted
+        await vis_db.execute(
+            "UPDATE chapter_facts SET scenes_json = '[]' WHERE novel_id = ?",
+            (NOVEL,),
+        )
+        await vis_db.commit()
+        assert (await vs.get_graph_data(NOVEL, 1, 5))["n"] == 3
+
+        invalidate_alias_cache(NOVEL)
+        assert (await vs.get_graph_data(NOVEL, 1, 5))["n"] == 4
+
+        vs.invalidate_map_cache(NOVEL)
+        assert (await vs.get_graph_data(NOVEL, 1, 5))["n"] == 5
+    vs._view_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_map_cache_is_size_bounded():
+    async def _fake_build(novel_id, start, end, layer_id=None):
+        return {}
+
+    vs._map_cache.clear()
+    with patch.object(vs, "_build_map_data", _fake_build), \
+         patch.object(vs, "_MAP_CACHE_MAX", 3):
+        for end in range(1, 6):
+            await vs.get_map_data(NOVEL, 1, end)
+    assert list(vs._map_cache) == [(NOVEL, 1, e, "") for e in (3, 4, 5)]
+    vs._map_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_fact_aggregate_cache_serves_private_copies():
+    from src.models.chapter_fact import ChapterFact
+
+    calls = []
+
+    async def _fake_load(novel_id, start, end):
+        calls.append((start, end))
+        return [ChapterFact.model_validate({
+            "chapter_id": 1, "novel_id": NOVEL,
+            "locations": [{"name": "水帘洞", "type": "洞"}],
+            "spatial_relationships": [{
+                "source": "花果山", "target": "东海", "relation_type": "adjacent",
+            }],
+        })]
+
+    vs._fact_agg_cache.clear()
+    with patch.object(vs, "_load_facts_in_range", _fake_load):
+        first = await vs._load_map_fact_aggregate(NOVEL, 1, 10)
+        first.loc_info["水帘洞"]["parent"] = "花果山"
+        next(iter(first.constraint_map.values()))["source"] = "东海"
+        first.trajectories["悟空"].append({"location": "水帘洞", "chapter": 1})
+
+        second = await vs._load_map_fact_aggregate(NOVEL, 1, 10)
+        assert calls == [(1, 10)]
+        assert second.loc_info["水帘洞"]["parent"] is None
+        assert next(iter(second.constraint_map.values()))["source"] == "花果山"
+        assert dict(second.trajectories) == {}
+
+        vs.invalidate_map_cache(NOVEL)
+        await vs._load_map_fact_aggregate(NOVEL, 1, 10)
+        assert calls == [(1, 10), (1, 10)]
+    vs._fact_agg_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_fact_aggregate_not_cached_when_invalidated_mid_load():
+    async def _fake_load(novel_id, start, end):
+        vs.invalidate_map_cache(novel_id)
+        return []
+
+    vs._fact_agg_cache.clear()
+    with patch.object(vs, "_load_facts_in_range", _fake_load):
+        await vs._load_map_fact_aggregate(NOVEL, 1, 10)
+    assert vs._fact_agg_cache == {}
+
+
+# ── Map-side conflict input ─────────────────────────────────────
+
+
+def _conflict_fact(ch, parent, direction, distance="near"):
+    from src.models.chapter_fact import ChapterFact
+
+    return ChapterFact.model_validate({
+        "chapter_id": ch,
+        "novel_id": NOVEL,
+        "characters": [{"name": "孙悟空", "locations_in_chapter": ["水帘洞"]}],
+        "locations": [{"name": "水帘洞", "type": "洞", "parent": parent}],
+        "spatial_relationships": [
+            {
+                "source": "花果山", "target": "东胜神洲",
+                "relation_type": "direction", "value": direction,
+            },
+            {
+                "source": "花果山", "target": "长安",
+                "relation_type": "distance", "distance_class": distance,
+            },
+        ],
+    })
+
+
+def test_conflict_dict_matches_full_dump_for_map_detectors():
+    from src.services.conflict_detector import (
+        _detect_direction_conflicts,
+        _detect_distance_conflicts,
+        _detect_location_conflicts,
+    )
+
+    facts = [
+        _conflict_fact(1, "花果山", "north_of"),
+        _conflict_fact(2, "花果山", "north_of"),
+        _conflict_fact(3, "东海", "south_of", "very_far"),
+        _conflict_fact(4, "东海", "south_of", "very_far"),
+    ]
+    full = [(f.chapter_id, f.model_dump()) for f in facts]
+    slim = vs._aggregate_map_facts(facts).conflict_input
+    for detect in (
+        _detect_location_conflicts,
+        lambda p: _detect_direction_conflicts(p, {}),
+        lambda p: _detect_distance_conflicts(p, {}),
+    ):
+        expected = [c.to_dict() for c in detect(full)]
+        assert len(expected) == 1
+        assert [c.to_dict() for c in detect(slim)] == expected
+
+
+def test_aggregate_map_facts_builds_geo_context_and_conflict_input():
+    from src.models.chapter_fact import ChapterFact
+
+    facts = [
+        ChapterFact.model_validate({
+            "chapter_id": 1, "novel_id": NOVEL,
+            "locations": [
+                {"name": "花果山", "type": "山", "description": "仙山福地"},
+                {"name": "水帘洞", "type": "洞", "parent": "花果山"},
+            ],
+            "spatial_relationships": [{
+                "source": "花果山", "target": "东海",
+                "relation_type": "adjacent", "narrative_evidence": "东海之滨",
+                "confidence": "low",
+            }],
+        }),
+        ChapterFact.model_validate({
+            "chapter_id": 2, "novel_id": NOVEL,
+            "characters": [
+                {"name": "悟空", "locations_in_chapter": ["长安", "花果山", "长安"]},
+                {"name": "悟空", "locations_in_chapter": ["花果山"]},
+            ],
+            "locations": [
+                {"name": "长安", "type": "城", "role": "referenced"},
+                {"name": "花果山", "type": "山", "role": "setting"},
+            ],
+            "spatial_relationships": [{
+                "source": "花果山", "target": "东海",
+                "relation_type": "adjacent", "confidence": "high",
+            }],
+        }),
+    ]
+
+    agg = vs._aggregate_map_facts(facts)
+    geo_context, parsed = agg.geo_context, agg.conflict_input
+
+    assert geo_context == [{
+        "chapter": 1,
+        "entries": [
+            {"type": "location", "name": "花果山", "text": "仙山福地"},
+            {"type": "spatial", "name": "花果山 → 东海", "text": "东海之滨"},
+        ],
+    }]
+    assert [ch for ch, _ in parsed] == [1, 2]
+    assert parsed[0][1]["locations"][1] == {"name": "水帘洞", "parent": "花果山"}
+    assert parsed[1][1]["locations"] == [
+        {"name": "长安", "parent": None},
+        {"name": "花果山", "parent": None},
+    ]
+
+    assert agg.loc_chapters == {"花果山": {1, 2}, "水帘洞": {1}, "长安": {2}}
+    assert agg.loc_info["水帘洞"]["parent"] == "花果山"
+    assert agg.loc_role == {"长安": "referenced", "花果山": "setting"}
+    assert agg.trajectories == {"悟空": [
+        {"location": "长安", "chapter": 2},
+        {"location": "花果山", "chapter": 2},
+    ]}
+    # The higher-confidence mention wins the constraint slot
+    [constraint] = agg.constraint_map.values()
+    assert constraint["confidence"] == "high"
+
+
+@pytest.mark.asyncio
+async def test_save_user_overrides_bulk_upserts_and_clears_layouts(vis_db):
+    await _insert_novel(vis_db)
+    await vis_db.execute(
+        "INSERT INTO map_layouts (novel_id, chapter_hash, layout_json) VALUES (?, ?, ?)",
+        (NOVEL, "h1", "[]"),
+    )
+    await vis_db.execute(
+        "INSERT INTO layer_layouts (novel_id, layer_id, chapter_hash, layout_json) "
+        "VALUES (?, ?, ?, ?)",
+        (NOVEL, "overworld", "h1", "[]"),
+    )
+    await vis_db.commit()
+    await vs.save_user_override(NOVEL, "花果山", 0.0, 0.0)
+
+    await vs.save_user_overrides_bulk(NOVEL, [
+        {"location_name": "花果山", "x": 5.0, "y": 6.0},
+        {"location_name": "水帘洞", "x": 1.0, "y": 2.0,
+         "constraint_type": "locked", "locked_parent": "花果山"},
+    ])
+
+    positions, locked, _ = await vs._load_all_overrides(NOVEL)
+    assert positions == {"花果山": (5.0, 6.0), "水帘洞": (1.0, 2.0)}
+    assert locked == {"水帘洞": "花果山"}
+    for table in ("map_layouts", "layer_layouts"):
+        cursor = await vis_db.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE novel_id = ?", (NOVEL,),
+        )
+        assert (await cursor.fetchone())[0] == 0, table
+
+
+@pytest.mark.asyncio
+async def test_save_user_overrides_bulk_rolls_back_on_error(vis_db):
+    await _insert_novel(vis_db)
+    with pytest.raises(KeyError):
+        await vs.save_user_overrides_bulk(NOVEL, [
+            {"location_name": "花果山", "x": 5.0, "y": 6.0},
+            {"location_name": "水帘洞", "x": 1.0},  # missing y
+        ])
+    assert await vs._load_all_overrides(NOVEL) == ({}, {}, {})
+
+
+# ── Factions ────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("loc_type,expected", [
+    ("门派", True),
+    ("帮派", True),
+    ("王朝", True),
+    ("宫殿", True),
+    ("书院", True),
+    ("山", False),
+    ("城市", False),
+    ("", False),
+])
+def test_is_org_type(loc_type, expected):
+    assert vs._is_org_type(loc_type) is expected
+    assert vs._is_org_type(loc_type) == any(
+        kw in loc_type for kw in vs._ORG_TYPE_KEYWORDS
+    )
+
+
+def _factions_facts():
+    from src.models.chapter_fact import ChapterFact
+
+    return [
+        ChapterFact.model_validate({
+            "chapter_id": 1, "novel_id": NOVEL,
+            "characters": [
+                {"name": "悟空", "locations_in_chapter": ["灵台方寸山", "花果山"]},
+                {"name": "须菩提", "locations_in_chapter": ["灵台方寸山"]},
+            ],
+            "locations": [
+                {"name": "灵台方寸山", "type": "门派"},
+                {"name": "花果山", "type": "山"},
+            ],
+            "org_events": [
+                {"org_name": "天庭", "org_type": "朝廷", "member": "猴王",
+                 "action": "加入", "role": "弼马温",
+                 "org_relation": {"other_org": "龙宫", "type": "从属"}},
+            ],
+            "new_concepts": [{"name": "佛门", "category": "宗教"}],
+        }),
+        ChapterFact.model_validate({
+            "chapter_id": 2, "novel_id": NOVEL,
+            "characters": [
+                {"name": "孙悟空", "locations_in_chapter": ["方寸山"]},
+            ],
+            "locations": [{"name": "方寸山", "type": "门派"}],
+            "org_events": [
+                {"org_name": "天庭", "member": "孙悟空", "action": "离开"},
+            ],
+        }),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_factions_data_aggregates_all_sources():
+    alias_map = {"悟空": "孙悟空", "猴王": "孙悟空", "方寸山": "灵台方寸山"}
+
+    async def _facts(*_args):
+        return _factions_facts()
+
+    async def _aliases(_novel_id):
+        return alias_map
+
+    with patch.object(vs, "_load_facts_in_range", _facts), \
+         patch.object(vs, "build_alias_map", _aliases):
+        data = await vs._build_factions_data(NOVEL, 1, 2)
+
+    assert data["orgs"] == [
+        {"id": "灵台方寸山", "name": "灵台方寸山", "type": "门派", "member_count": 2},
+        {"id": "天庭", "name": "天庭", "type": "朝廷", "member_count": 1},
+        {"id": "龙宫", "name": "龙宫", "type": "组织", "member_count": 0},
+        {"id": "佛门", "name": "佛门", "type": "宗教", "member_count": 0},
+    ]
+    assert data["relations"] == [
+        {"source": "天庭", "target": "龙宫", "type": "从属", "chapter": 1},
+    ]
+    assert data["members"] == {
+        "天庭": [{"person": "孙悟空", "role": "弼马温", "status": "加入"}],
+        "灵台方寸山": [
+            {"person": "孙悟空", "role": "", "status": "出现"},
+            {"person": "须菩提", "role": "", "status": "出现"},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_factions_data_source_precedence_across_chapters():
+    from src.models.chapter_fact import ChapterFact
+
+    # Concepts and org locations seen earlier must not override the type of
+    # an org that an org_event names in a later chapter.
+    facts = [
+        ChapterFact.model_validate({
+            "chapter_id": 1, "novel_id": NOVEL,
+            "locations": [{"name": "天庭", "type": "宫殿"}],
+            "new_concepts": [{"name": "灵山", "category": "宗教"}],
+        }),
+        ChapterFact.model_validate({
+            "chapter_id": 2, "novel_id": NOVEL,
+            "org_events": [
+                {"org_name": "天庭", "org_type": "朝廷"},
+                {"org_name": "灵山", "org_type": "佛门"},
+            ],
+            "locations": [{"name": "斧头帮", "type": "帮派"}],
+        }),
+    ]
+
+    async def _facts(*_args):
+        return facts
+
+    async def _aliases(_novel_id):
+        return {}
+
+    with patch.object(vs, "_load_facts_in_range", _facts), \
+         patch.object(vs, "build_alias_map", _aliases):
+        data = await vs._build_factions_data(NOVEL, 1, 2)
+
+    assert [(o["name"], o["type"]) for o in data["orgs"]] == [
+        ("天庭", "朝廷"), ("灵山", "佛门"), ("斧头帮", "帮派"),
+    ]
+
+
+# ── Layout read-through cache ───────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_layout_read_through_cache(vis_db):
+    await _insert_novel(vis_db)
+    await vis_db.execute(
+        "INSERT INTO map_layouts (novel_id, chapter_hash, layout_json, layout_mode) "
+        "VALUES (?, ?, ?, ?)",
+        (NOVEL, "h1", '[{"name": "花果山", "x": 1.0, "y": 2.0}]', "constraint"),
+    )
+    await vis_db.commit()
+    vs._layout_rt_cache.clear()
+
+    layout, mode, _, _ = await vs._compute_or_load_layout(NOVEL, "h1", [], [])
+    assert mode == "constraint"
+    layout[0]["x"] = 99.0  # caller mutation must not leak into the cache
+
+    # Served from memory even though the row is gone
+    await vis_db.execute("DELETE FROM map_layouts WHERE novel_id = ?", (NOVEL,))
+    await vis_db.commit()
+    layout, mode, _, _ = await vs._compute_or_load_layout(NOVEL, "h1", [], [])
+    assert layout == [{"name": "花果山", "x": 1.0, "y": 2.0}]
+
+    # Saving an override invalidates the in-process entry
+    await vs.save_user_override(NOVEL, "花果山", 0.0, 0.0)
+    layout, mode, _, _ = await vs._compute_or_load_layout(NOVEL, "h1", [], [])
+    assert (layout, mode) == ([], "hierarchy")
+    vs._layout_rt_cache.clear()
+
+
+# ── World-structure summary ─────────────────────────────────────
+
+
+def test_build_ws_summary_counts_and_merges_layers():
+    from src.models.world_structure import MapLayer, WorldStructure
+
+    ws = WorldStructure(
+        novel_id=NOVEL,
+        layers=[
+            MapLayer(layer_id="overworld", name="人间", layer_type="overworld"),
+            MapLayer(layer_id="sky", name="天界", layer_type="sky"),
+            MapLayer(layer_id="underworld", name="地府", layer_type="underground"),
+        ],
+        location_layer_map={
+            "花果山": "overworld", "长安": "overworld",
+            "凌霄宝殿": "sky", "兜率宫": "sky",
+            "森罗殿": "underworld",
+        },
+    )
+    summary = vs._build_ws_summary(ws)
+    by_id = {layer["layer_id"]: layer for layer in summary["layers"]}
+    assert [layer["layer_id"] for layer in summary["layers"]] == ["overworld", "sky", "underworld"]
+    assert by_id["overworld"]["location_count"] == 2
+    assert by_id["sky"]["location_count"] == 2
+    assert by_id["underworld"]["location_count"] == 1
+    assert by_id["overworld"]["merged"] is False
+    assert by_id["sky"]["merged"] is False
+    assert by_id["underworld"]["merged"] is True
+
+
+# ── Timeline ────────────────────────────────────────────────────
+
+
+def _timeline_facts():
+    from src.models.chapter_fact import ChapterFact
+
+    return [
+        ChapterFact.model_validate({
+            "chapter_id": ch, "novel_id": NOVEL,
+            "characters": [{"name": "悟空", "locations_in_chapter": ["花果山"]}],
+            "events": [{
+                "summary": f"第{ch}回大战", "type": "战斗",
+                "participants": ["悟空", "哪吒"] if ch == 1 else ["悟空"],
+                "location": "花果山",
+            }],
+            "item_events": [
+                {"item_name": "金箍棒", "item_type": "兵器", "action": "获得",
+                 "actor": "悟空", "recipient": "八戒"},
+                {"item_name": "金箍棒", "item_type": "兵器", "action": "提及",
+                 "actor": "悟空"},
+            ] if ch == 2 else [],
+            "org_events": [
+                {"org_name": "天庭", "member": "悟空", "action": "加入", "role": "弼马温"},
+            ] if ch == 3 else [],
+            "relationships": [
+                {"person_a": "悟空", "person_b": "八戒", "relation_type": "师兄弟",
+                 "is_new": True, "evidence": "结为兄弟"},
+            ] if ch == 3 else [],
+        })
+        for ch in (1, 2, 3)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_timeline_data_events_and_swimlanes():
+    from src.db import chapter_fact_store
+
+    async def _facts(*_args):
+        return _timeline_facts()
+
+    async def _scenes(_novel_id):
+        return [{"chapter": 1, "characters": ["悟空"], "emotional_tone": "紧张"}]
+
+    with patch.object(vs, "_load_facts_in_range", _facts), \
+         patch.object(chapter_fact_store, "get_all_scenes", _scenes):
+        data = await vs._build_timeline_data(NOVEL, 1, 3)
+
+    events = data["events"]
+    assert [e["id"] for e in events] == list(range(len(events)))
+    assert [(e["chapter"], e["type"]) for e in events] == [
+        (1, "战斗"), (1, "角色登场"),
+        (2, "战斗"), (2, "物品交接"),
+        (3, "战斗"), (3, "组织变动"), (3, "关系变化"),
+    ]
+    assert events[0] == {
+        "id": 0, "chapter": 1, "summary": "第1回大战", "type": "战斗",
+        "importance": "medium", "participants": ["悟空", "哪吒"],
+        "location": "花果山", "is_major": False, "emotional_tone": "紧张",
+    }
+    assert events[1]["summary"] == "悟空 首次登场"
+    assert events[3]["summary"] == "悟空 获得 金箍棒 → 八戒"
+    assert events[5]["summary"] == "悟空 加入 天庭 (弼马温)"
+    assert events[6]["summary"] == "悟空 与 八戒 建立师兄弟关系（结为兄弟）"
+    assert data["swimlanes"] == {
+        "悟空": [0, 1, 2, 3, 4, 5, 6],
+        "哪吒": [0],
+        "八戒": [3, 6],
+    }
+    assert list(data["swimlanes"]) == ["悟空", "哪吒", "八戒"]
+    assert data["total_swimlanes"] == 3
+    assert data["suggested_min_swimlane"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_factions_data_without_aliases():
+    async def _facts(*_args):
+        return _factions_facts()
+
+    async def _aliases(_novel_id):
+        return {}
+
+    with patch.object(vs, "_load_facts_in_range", _facts), \
+         patch.object(vs, "build_alias_map", _aliases):
+        data = await vs._build_factions_data(NOVEL, 1, 2)
+
+    assert data["members"]["灵台方寸山"] == [
+        {"person": "悟空", "role": "", "status": "出现"},
+        {"person": "须菩提", "role": "", "status": "出现"},
+    ]
+    assert data["members"]["方寸山"] == [
+        {"person": "孙悟空", "role": "", "status": "出现"},
+    ]
+    assert {m["person"] for m in data["members"]["天庭"]} == {"猴王", "孙悟空"}
+
+
+# ── Shared fact scope ───────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_shared_fact_scope_loads_each_range_once():
+    calls = []
+
+    async def _fetch(novel_id, start, end):
+        calls.append((novel_id, start, end))
+        return _factions_facts()
+
+    with patch.object(vs, "_fetch_facts_in_range", _fetch):
+        await vs._load_facts_in_range(NOVEL, 1, 2)
+        await vs._load_facts_in_range(NOVEL, 1, 2)
+        assert len(calls) == 2
+
+        calls.clear()
+        with vs.shared_fact_scope():
+            first = await vs._load_facts_in_range(NOVEL, 1, 2)
+            second = await vs._load_facts_in_range(NOVEL, 1, 2)
+            await vs._load_facts_in_range(NOVEL, 1, 1)
+        assert calls == [(NOVEL, 1, 2), (NOVEL, 1, 1)]
+        assert first == second and first is not second
+
+        calls.clear()
+        await vs._load_facts_in_range(NOVEL, 1, 2)
+        assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_facts_in_range_parses_rows_in_chapter_order(vis_db):
+    await _insert_novel(vis_db)
+    for num in (3, 1, 2):
+        cursor = await vis_db.execute(
+            "INSERT INTO chapters (novel_id, chapter_num, title, content) "
+            "VALUES (?, ?, ?, '')",
+            (NOVEL, num, f"第{num}回"),
+        )
+        await vis_db.execute(
+            "INSERT INTO chapter_facts (novel_id, chapter_id, fact_json) VALUES (?, ?, ?)",
+            (
+                NOVEL, cursor.lastrowid,
+                '{"chapter_id": 0, "novel_id": "x", '
+                f'"locations": [{{"name": "地{num}", "type": "山"}}]}}',
+            ),
+        )
+    await vis_db.commit()
+
+    facts = await vs._fetch_facts_in_range(NOVEL, 1, 2)
+
+    assert [f.chapter_id for f in facts] == [1, 2]
+    assert {f.novel_id for f in facts} == {NOVEL}
+    assert [f.locations[0].name for f in facts] == ["地1", "地2"]
+    assert all(isinstance(f, vs.ChapterFact) for f in facts)
+
+
+def test_parse_fact_rows_rejects_invalid_fact():
+    from pydantic import ValidationError
+
+    from src.db.chapter_fact_store import parse_fact_rows
+
+    with pytest.raises(ValidationError):
+        parse_fact_rows([('{"locations": [{"name": "x"}]}', 1)], NOVEL)
+
+
+# ── Graph ───────────────────────────────────────────────────────
+
+
+def _graph_facts():
+    from src.models.chapter_fact import ChapterFact
+
+    return [
+        ChapterFact.model_validate({
+            "chapter_id": 1, "novel_id": NOVEL,
+            "characters": [
+                {"name": "悟空", "locations_in_chapter": ["方寸山"]},
+                {"name": "须菩提", "locations_in_chapter": ["灵台方寸山"]},
+                {"name": "群妖"},
+            ],
+            "locations": [{"name": "灵台方寸山", "type": "门派"}],
+            "relationships": [
+                {"person_a": "悟空", "person_b": "须菩提", "relation_type": "师徒"},
+                {"person_a": "孙悟空", "person_b": "悟空", "relation_type": "朋友"},
+            ],
+        }),
+        ChapterFact.model_validate({
+            "chapter_id": 2, "novel_id": NOVEL,
+            "characters": [
+                {"name": "孙悟空", "locations_in_chapter": ["灵台方寸山"]},
+                {"name": "须菩提"},
+                {"name": "猪八戒"},
+            ],
+            "org_events": [
+                {"org_name": "天蓬府", "member": "猪八戒", "action": "加入"},
+            ],
+            "relationships": [
+                {"person_a": "须菩提", "person_b": "孙悟空", "relation_type": "师父"},
+                {"person_a": "猪八戒", "person_b": "孙悟空", "relation_type": "师兄弟"},
+            ],
+        }),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_graph_data_aggregates_nodes_and_edges():
+    alias_map = {"悟空": "孙悟空", "方寸山": "灵台方寸山"}
+
+    async def _facts(*_args):
+        return _graph_facts()
+
+    async def _aliases(_novel_id):
+        return alias_map
+
+    async def _ungrounded(*_args):
+        return set()
+
+    async def _targets(_novel_id):
+        return set()
+
+    with patch.object(vs, "_load_facts_in_range", _facts), \
+         patch.object(vs, "build_alias_map", _aliases), \
+         patch("src.services.hallucination_filter.get_ungrounded_persons", _ungrounded), \
+         patch("src.services.alias_resolver.get_override_targets", _targets):
+        data = await vs._build_graph_data(NOVEL, 1, 2)
+
+    assert [(n["name"], n["chapter_count"], n["org"], n["aliases"]) for n in data["nodes"]] == [
+        ("孙悟空", 2, "灵台方寸山", ["悟空"]),
+        ("须菩提", 2, "", []),
+        ("猪八戒", 1, "天蓬府", []),
+    ]
+    assert [
+        (e["source"], e["target"], e["relation_type"], e["weight"], e["chapters"])
+        for e in data["edges"]
+    ] == [
+        ("孙悟空", "须菩提", "师徒", 2, [1, 2]),
+        ("孙悟空", "猪八戒", "师兄弟", 1, [2]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_graph_data_drops_ungrounded_edges_from_stats():
+    async def _facts(*_args):
+        return _graph_facts()
+
+    async def _aliases(_novel_id):
+        return {"悟空": "孙悟空"}
+
+    async def _ungrounded(*_args):
+        return {"猪八戒"}
+
+    async def _targets(_novel_id):
+        return set()
+
+    with patch.object(vs, "_load_facts_in_range", _facts), \
+         patch.object(vs, "build_alias_map", _aliases), \
+         patch("src.services.hallucination_filter.get_ungrounded_persons", _ungrounded), \
+         patch("src.services.alias_resolver.get_override_targets", _targets):
+        data = await vs._build_graph_data(NOVEL, 1, 2)
+
+    assert "猪八戒" not in {n["name"] for n in data["nodes"]}
+    [edge] = data["edges"]
+    assert (edge["source"], edge["target"], edge["weight"]) == ("孙悟空", "须菩提", 2)
+    assert edge["all_types"][0] == edge["relation_type"]
+    assert data["max_edge_weight"] == 2
+    assert data["type_counts"] == {edge["relation_type"]: 1}
+    assert data["category_counts"] == {edge["category"]: 1}
+    assert data["filtered_ungrounded_persons"] == ["猪八戒"]
+
+
+# ── Hierarchy levels ────────────────────────────────────────────
+
+
+def _recursive_level(loc_info, name, visited=None):
+    if visited is None:
+        visited = set()
+    if name in visited:
+        return 0
+    visited.add(name)
+    info = loc_info.get(name)
+    if not info or not info["parent"]:
+        return 0
+    return 1 + _recursive_level(loc_info, info["parent"], visited)
+
+
+def test_hierarchy_levels_handles_chains_and_cycles():
+    parents = {
+        "天下": None, "东胜神洲": "天下", "傲来国": "东胜神洲", "花果山": "傲来国",
+        "水帘洞": "花果山", "龙宫": "东海",  # parent outside loc_info
+        "甲": "乙", "乙": "丙", "丙": "甲", "丁": "甲",  # cycle with a tail
+        "自环": "自环",
+    }
+    loc_info = {n: {"parent": p} for n, p in parents.items()}
+
+    levels = vs._hierarchy_levels(loc_info)
+
+    assert levels["水帘洞"] == 4
+    assert levels["龙宫"] == 1
+    assert (levels["甲"], levels["丁"], levels["自环"]) == (3, 4, 1)
+    assert set(levels) == set(loc_info)
+
+
+def test_hierarchy_levels_matches_recursive_walk():
+    import random
+
+    rng = random.Random(7)
+    names = [f"地{i}" for i in range(200)]
+    for _ in range(20):
+        loc_info = {
+            n: {"parent": rng.choice(names + [None, "", "外"])}
+            for n in rng.sample(names, 150)
+        }
+        levels = vs._hierarchy_levels(loc_info)
+        assert levels == {n: _recursive_level(loc_info, n) for n in loc_info}
+
+
+# ── Constraint cleaning ─────────────────────────────────────────
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("north_of", "north_of"),
+    ("以北", "north_of"),
+    ("东北", "northeast_of"),
+    ("位于西南方", "southwest_of"),
+    ("在东边", "east_of"),
+])
+def test_clean_spatial_constraints_normalizes_directions(value, expected):
+    locations = [{"name": "甲", "level": 0}, {"name": "乙", "level": 0}]
+    constraints = [{
+        "source": "甲", "target": "乙", "relation_type": "direction", "value": value,
+    }]
+    [c] = vs._clean_spatial_constraints(constraints, locations)
+    assert c["value"] == expected
+
+
+def test_clean_spatial_constraints_drops_unparseable_direction():
+    locations = [{"name": "甲", "level": 0}, {"name": "乙", "level": 0}]
+    constraints = [{
+        "source": "甲", "target": "乙", "relation_type": "direction", "value": "附近",
+    }]
+    assert vs._clean_spatial_constraints(constraints, locations) == []
+
+
+def test_clean_spatial_constraints_swaps_inverted_contains_in_place():
+    locations = [
+        {"name": "花果山", "level": 0, "parent": None},
+        {"name": "水帘洞", "level": 1, "parent": "花果山"},
+    ]
+    c = {"source": "水帘洞", "target": "花果山", "relation_type": "contains", "value": ""}
+    [out] = vs._clean_spatial_constraints([c], locations)
+    assert out is c
+    assert (c["source"], c["target"]) == ("花果山", "水帘洞")
+
+
+@pytest.mark.asyncio
+async def test_fetch_facts_in_range_streams_across_chunks(vis_db):
+    await _insert_novel(vis_db)
+    for num in range(1, 8):
+        cursor = await vis_db.execute(
+            "INSERT INTO chapters (novel_id, chapter_num, title, content) "
+            "VALUES (?, ?, ?, '')",
+            (NOVEL, num, f"第{num}回"),
+        )
+        await vis_db.execute(
+            "INSERT INTO chapter_facts (novel_id, chapter_id, fact_json) VALUES (?, ?, ?)",
+            (NOVEL, cursor.lastrowid, '{"chapter_id": 0, "novel_id": "x"}'),
+        )
+    await vis_db.commit()
+
+    with patch.object(vs, "_FACT_FETCH_CHUNK", 3):
+        facts = await vs._fetch_facts_in_range(NOVEL, 2, 7)
+
+    assert [f.chapter_id for f in facts] == [2, 3, 4, 5, 6, 7]
+
+
+@pytest.mark.asyncio
+async def test_get_earlier_location_names_reads_names_in_sql(vis_db):
+    await _insert_novel(vis_db)
+    fact_jsons = {
+        1: '{"locations": [{"name": "花果山", "type": "山"}, {"name": "水帘洞", "type": "洞"}]}',
+        2: '{"locations": [{"name": "花果山", "type": "山"}, {"type": "山"}]}',
+        3: '{"characters": []}',
+        4: '{"locations": [{"name": "长安", "type": "城"}]}',
+    }
+    for num, fact_json in fact_jsons.items():
+        cursor = await vis_db.execute(
+            "INSERT INTO chapters (novel_id, chapter_num, title, content) "
+            "VALUES (?, ?, ?, '')",
+            (NOVEL, num, f"第{num}回"),
+        )
+        await vis_db.execute(
+            "INSERT INTO chapter_facts (novel_id, chapter_id, fact_json) VALUES (?, ?, ?)",
+            (NOVEL, cursor.lastrowid, fact_json),
+        )
+    await vis_db.commit()
+
+    # Chapter 4 is the first in range, so only chapters 1-3 count
+    assert await vs._get_earlier_location_names(NOVEL, 1, 4) == {"花果山", "水帘洞"}
+    assert await vs._get_earlier_location_names(NOVEL, 2, 4) == {"花果山"}
+    assert await vs._get_earlier_location_names(NOVEL, 4, 4) == set()
+
+
+@pytest.mark.asyncio
+async def test_fetch_facts_in_range_reuses_parsed_facts(vis_db):
+    from src.db import chapter_fact_store
+
+    await _insert_novel(vis_db)
+    fact_ids = []
+    for num in (1, 2):
+        cursor = await vis_db.execute(
+            "INSERT INTO chapters (novel_id, chapter_num, title, content) "
+            "VALUES (?, ?, ?, '')",
+            (NOVEL, num, f"第{num}回"),
+        )
+        cursor = await vis_db.execute(
+            "INSERT INTO chapter_facts (novel_id, chapter_id, fact_json) VALUES (?, ?, ?)",
+            (NOVEL, cursor.lastrowid,
+             '{"chapter_id": 0, "novel_id": "x", "locations": [{"name": "花果山", "type": "山"}]}'),
+        )
+        fact_ids.append(cursor.lastrowid)
+    await vis_db.commit()
+
+    parsed_rows = []
+    real_parse = chapter_fact_store.parse_fact_rows
+
+    def _counting_parse(rows, novel_id):
+        parsed_rows.extend(num for _, num in rows)
+        return real_parse(rows, novel_id)
+
+    chapter_fact_store._parsed_fact_cache.clear()
+    with patch.object(chapter_fact_store, "parse_fact_rows", _counting_parse):
+        first = await vs._fetch_facts_in_range(NOVEL, 1, 2)
+        second = await vs._fetch_facts_in_range(NOVEL, 1, 2)
+        assert parsed_rows == [1, 2]
+        assert [a is b for a, b in zip(first, second)] == [True, True]
+
+        # Re-extracted text is a different key: only that row is parsed again
+        await vis_db.execute(
+            "UPDATE chapter_facts SET fact_json = ? WHERE id = ?",
+            ('{"chapter_id": 0, "novel_id": "x", "locations": [{"name": "长安", "type": "城"}]}',
+             fact_ids[1]),
+        )
+        await vis_db.commit()
+        third = await vs._fetch_facts_in_range(NOVEL, 1, 2)
+    assert parsed_rows == [1, 2, 2]
+    assert third[0] is first[0]
+    assert [loc.name for loc in third[1].locations] == ["长安"]
+    # Keys hold a fixed-size digest, not the fact text
+    assert all(len(key[2]) == 16 for key in chapter_fact_store._parsed_fact_cache)
+    chapter_fact_store._parsed_fact_cache.clear()
+
+
+def test_clean_spatial_constraints_dedups_after_fixing():
+    locations = [
+        {"name": "花果山", "level": 0, "parent": None},
+        {"name": "水帘洞", "level": 1, "parent": "花果山"},
+    ]
+    constraints = [
+        {"source": "花果山", "target": "水帘洞", "relation_type": "contains",
+         "value": "", "confidence": "low"},
+        {"source": "水帘洞", "target": "花果山", "relation_type": "contains",
+         "value": "", "confidence": "high"},
+        {"source": "水帘洞", "target": "花果山", "relation_type": "adjacent",
+         "value": "", "confidence": "medium"},
+    ]
+    out = vs._clean_spatial_constraints(constraints, locations)
+    assert [(c["relation_type"], c["source"], c["target"], c["confidence"]) for c in out] == [
+        ("contains", "花果山", "水帘洞", "high"),
+        ("adjacent", "水帘洞", "花果山", "medium"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_save_cached_layer_layouts_round_trip(memory_db):
+    from src.db import world_structure_store
+
+    async def _factory():
+        return _NonClosing(memory_db)
+
+    await _insert_novel(memory_db)
+    layouts = {
+        "overworld": [{"name": "花果山", "x": 1.0, "y": 2.0}],
+        "sky": [{"name": "凌霄殿", "x": 3.0, "y": 4.0}],
+    }
+    with patch.object(world_structure_store, "get_connection", _factory), \
+         patch.object(world_structure_store, "acquire_connection", _factory):
+        await vs._save_cached_layer_layout(NOVEL, "sky", "h", [], "hierarchy")
+        await vs._save_cached_layer_layouts(NOVEL, "h", layouts, "layered")
+        for lid, items in layouts.items():
+            cached = await vs._load_cached_layer_layout(NOVEL, lid, "h")
+            assert cached["layout"] == items
+            assert cached["layout_mode"] == "layered"
@@ -0,0 +1,279 @@
+"""Tests for WorldStructureAgent LLM update batching and dispatch."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.models.chapter_fact import ChapterFact, LocationFact
+from src.models.world_structure import WorldStructure
+from src.services.world_structure_agent import WorldStructureAgent, _add_vote
+
+
+class _FakeLLM:
+    def __init__(self):
+        self.prompts: list[str] = []
+
+    async def generate(self, *, system, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return {"operations": [], "reasoning": ""}, None
+
+
+def _agent(batch_size: int) -> tuple[WorldStructureAgent, _FakeLLM]:
+    llm = _FakeLLM()
+    agent = WorldStructureAgent("test", llm=llm, llm_batch_size=batch_size)
+    agent.structure = WorldStructure(novel_id="test")
+    return agent, llm
+
+
+def _fact(chapter: int, loc: str) -> ChapterFact:
+    return ChapterFact(
+        chapter_id=chapter, novel_id="test",
+        locations=[LocationFact(name=loc, type="山")],
+    )
+
+
+@pytest.mark.asyncio
+async def test_queued_chapters_share_one_llm_call():
+    agent, llm = _agent(batch_size=2)
+    jobs = [(3, [], _fact(3, "花果山")), (4, [], _fact(4, "五行山"))]
+
+    assert await agent._run_llm_update(jobs) == (3, 4, [])
+
+    assert len(llm.prompts) == 1
+    assert agent.llm_call_count == 1
+    prompt = llm.prompts[0]
+    assert "第3章:\n- 花果山" in prompt
+    assert "第4章:\n- 五行山" in prompt
+
+
+@pytest.mark.asyncio
+async def test_single_chapter_prompt_has_no_chapter_headers():
+    agent, llm = _agent(batch_size=1)
+
+    await agent._run_llm_update([(3, [], _fact(3, "花果山"))])
+
+    assert "第3章:" not in llm.prompts[0]
+    assert "- 花果山 (type=山)" in llm.prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_flush_sends_partial_batch_and_saves():
+    agent, llm = _agent(batch_size=4)
+    save = AsyncMock()
+    with patch("src.services.world_structure_agent.world_structure_store.save", save):
+        await agent.flush_llm_updates()  # nothing queued
+        assert llm.prompts == [] and save.await_count == 0
+
+        agent._pending_llm_jobs = [(7, [], _fact(7, "花果山"))]
+        await agent.flush_llm_updates()
+
+    assert len(llm.prompts) == 1
+    save.assert_awaited_once_with("test", agent.structure)
+
+
+@pytest.mark.asyncio
+async def test_failed_llm_call_yields_no_operations():
+    agent, llm = _agent(batch_size=1)
+    llm.generate = AsyncMock(side_effect=TimeoutError)
+
+    assert await agent._run_llm_update([(5, [], _fact(5, "花果山"))]) == (5, 5, [])
+
+
+@pytest.mark.asyncio
+async def test_background_results_apply_in_send_order():
+    agent, _llm = _agent(batch_size=1)
+    release_first = asyncio.Event()
+    applied: list[str] = []
+
+    async def _call(jobs):
+        ch = jobs[0][0]
+        if ch == 1:
+            await release_first.wait()
+        return [{"op": f"ch{ch}"}]
+
+    agent._call_llm_for_update = _call
+    agent._apply_operations = lambda ops: applied.extend(op["op"] for op in ops)
+
+    agent._pending_llm_jobs = [(1, [], _fact(1, "花果山"))]
+    agent._dispatch_llm_update()
+    agent._pending_llm_jobs = [(2, [], _fact(2, "五行山"))]
+    agent._dispatch_llm_update()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    # Chapter 2 finished first but waits behind chapter 1
+    agent._apply_finished_llm_updates()
+    assert applied == []
+
+    release_first.set()
+    with patch("src.services.world_structure_agent.world_structure_store.save", AsyncMock()):
+        await agent.flush_llm_updates()
+    assert applied == ["ch1", "ch2"]
+    assert agent._inflight_llm == []
+
+
+def test_apply_operations_dispatches_by_op_type():
+    agent, _llm = _agent(batch_size=1)
+    agent._apply_operations([
+        {"op": "SET_PARENT", "location_name": "水帘洞", "parent": "花果山"},
+        {"op": "NO_CHANGE"},
+        {"op": "BOGUS"},
+        {"op": "SET_PARENT", "location_name": "花果山", "parent": "东胜神洲"},
+    ])
+    assert agent.structure.location_parents == {"水帘洞": "花果山", "花果山": "东胜神洲"}
+
+
+@pytest.mark.asyncio
+async def test_structure_saved_every_few_chapters_and_on_flush():
+    agent, llm = _agent(batch_size=1)
+    save = AsyncMock()
+    with patch("src.services.world_structure_agent.world_structure_store.save", save):
+        for ch in range(6, 13):
+            await agent.process_chapter(ch, "", _fact(ch, f"山{ch}"))
+        assert save.await_count == 1  # after chapter 10
+
+        await agent.flush_llm_updates()
+        assert save.await_count == 2
+        await agent.flush_llm_updates()  # nothing left to write
+        assert save.await_count == 2
+    assert llm.prompts == []
+
+
+def test_add_vote_accumulates_into_counters():
+    votes = {}
+    _add_vote(votes, "水帘洞", "花果山", 1)
+    _add_vote(votes, "水帘洞", "花果山", 0.5)
+    _add_vote(votes, "水帘洞", "东胜神洲", 2)
+    assert dict(votes["水帘洞"]) == {"花果山": 1.5, "东胜神洲": 2}
+    assert votes["水帘洞"].most_common(1) == [("东胜神洲", 2)]
+
+
+def test_name_containment_votes_follow_suffix_direction():
+    agent, _ = _agent(batch_size=1)
+    agent.structure.location_tiers.update({"石圪节": "city", "黄原": "city"})
+    fact = ChapterFact(
+        chapter_id=1,
+        novel_id="test",
+        locations=[
+            LocationFact(name="石圪节公社", type="地点"),
+            LocationFact(name="黄原汽车站", type="地点"),
+        ],
+    )
+    agent._apply_heuristic_updates(1, fact)
+    # Admin suffix: the longer name is the parent
+    assert agent._parent_votes["石圪节"]["石圪节公社"] == 1
+    # Descriptive suffix: the longer name is the child
+    assert agent._parent_votes["黄原汽车站"]["黄原"] == 1
+
+
+@pytest.mark.asyncio
+async def test_flush_post_processes_structure_when_operations_land():
+    agent, _llm = _agent(batch_size=4)
+    agent._post_process_structure = Mock()
+
+    async def _call(jobs):
+        return [{"op": "SET_PARENT", "location_name": "水帘洞", "parent": "花果山"}]
+
+    agent._call_llm_for_update = _call
+    with patch("src.services.world_structure_agent.world_structure_store.save", AsyncMock()):
+        agent._pending_llm_jobs = [(7, [], _fact(7, "水帘洞"))]
+        await agent.flush_llm_updates()
+        agent._post_process_structure.assert_called_once_with()
+
+        agent._call_llm_for_update = AsyncMock(return_value=[])
+        agent._pending_llm_jobs = [(8, [], _fact(8, "花果山"))]
+        await agent.flush_llm_updates()
+        agent._post_process_structure.assert_called_once_with()  # no new operations
+
+
+@pytest.mark.asyncio
+async def test_early_chapters_are_sent_by_chapter_five():
+    agent, llm = _agent(batch_size=8)
+    with patch("src.services.world_structure_agent.world_structure_store.save", AsyncMock()):
+        for ch in range(1, 6):
+            await agent.process_chapter(ch, "", _fact(ch, f"山{ch}"))
+        assert agent._pending_llm_jobs == []
+        await agent.flush_llm_updates()
+    assert len(llm.prompts) == 1
+    assert "第1章:" in llm.prompts[0] and "第5章:" in llm.prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_sparse_trigger_is_sent_once_it_ages():
+    agent, llm = _agent(batch_size=4)
+    agent._should_trigger_llm = lambda chapter_num, signals, fact: chapter_num == 6
+    with patch("src.services.world_structure_agent.world_structure_store.save", AsyncMock()):
+        for ch in range(6, 11):
+            await agent.process_chapter(ch, "", _fact(ch, f"山{ch}"))
+        assert [job[0] for job in agent._pending_llm_jobs] == [6]
+
+        await agent.process_chapter(11, "", _fact(11, "山11"))
+        assert agent._pending_llm_jobs == []
+        assert len(agent._inflight_llm) == 1
+        await agent.flush_llm_updates()
+    assert len(llm.prompts) == 1
+    assert "- 山6 (type=山)" in llm.prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_discard_cancels_in_flight_and_sends_nothing_new():
+    agent, llm = _agent(batch_size=4)
+    never = asyncio.Event()
+
+    async def _call(jobs):
+        await never.wait()
+        return []
+
+    agent._call_llm_for_update = _call
+    agent._pending_llm_jobs = [(1, [], _fact(1, "花果山"))]
+    agent._dispatch_llm_update()
+    in_flight = agent._inflight_llm[0]
+    agent._pending_llm_jobs = [(2, [], _fact(2, "五行山"))]
+    agent._unsaved_chapters = 2
+
+    save = AsyncMock()
+    with patch("src.services.world_structure_agent.world_structure_store.save", save):
+        await agent.discard_llm_updates()
+
+    await asyncio.gather(in_flight, return_exceptions=True)
+    assert in_flight.cancelled()
+    assert agent._pending_llm_jobs == [] and agent._inflight_llm == []
+    save.assert_awaited_once_with("test", agent.structure)
+    assert llm.prompts == []
+
+
+@pytest.mark.asyncio
+async def test_suspend_keeps_updates_for_the_resumed_agent():
+    agent, llm = _agent(batch_size=4)
+    release = asyncio.Event()
+
+    async def _call(jobs):
+        await release.wait()
+        return []
+
+    agent._call_llm_for_update = _call
+    agent._pending_llm_jobs = [(1, [], _fact(1, "花果山"))]
+    agent._dispatch_llm_update()
+    in_flight = agent._inflight_llm[0]
+    agent._pending_llm_jobs = [(2, [], _fact(2, "五行山"))]
+    agent._unsaved_chapters = 2
+
+    save = AsyncMock()
+    with patch("src.services.world_structure_agent.world_structure_store.save", save):
+        await agent.suspend_llm_updates()
+    save.assert_awaited_once_with("test", agent.structure)
+    assert not in_flight.done()
+
+    resumed, resumed_llm = _agent(batch_size=4)
+    resumed.adopt_llm_updates(agent)
+    assert agent._pending_llm_jobs == [] and agent._inflight_llm == []
+    assert resumed._inflight_llm == [in_flight]
+    assert [job[0] for job in resumed._pending_llm_jobs] == [2]
+
+    release.set()
+    with patch("src.services.world_structure_agent.world_structure_store.save", AsyncMock()):
+        await resumed.flush_llm_updates()
+    assert resumed._pending_llm_jobs == [] and resumed._inflight_llm == []
+    assert len(resumed_llm.prompts) == 1
+    assert "五行山" in resumed_llm.prompts[0]